@@ -5,11 +5,12 @@ This application allows users to upload Excel files and generate
 either Participation Reports or Performance Reports.
 """
 
+import io
 import os
-import pandas as pd
+import zipfile
 from flask import Flask, render_template, request, send_file, flash, redirect, url_for
 from werkzeug.utils import secure_filename
-from reports.participation import generate_participation_report
+from reports.participation import generate_participation_report, read_csv_with_encoding, read_excel_file
 from reports.performance import generate_performance_report
 
 app = Flask(__name__)
@@ -21,10 +22,27 @@ app.config['ALLOWED_EXTENSIONS'] = {'csv', 'xlsx', 'xls'}
 # Create uploads directory if it doesn't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Number of leading bytes inspected when detecting the file type
+FILE_HEADER_SIZE = 64
+# ZIP signature shared by all Office Open XML files
+ZIP_SIGNATURE = b'PK'
+# Entry names that identify a ZIP file as an Excel workbook
+EXCEL_ZIP_MARKERS = (b'xl/', b'[Content_Types].xml')
+# Archive entry every xlsx workbook contains
+XLSX_WORKBOOK_ENTRY = 'xl/workbook.xml'
+# UTF-8 and UTF-16 (LE/BE) byte order marks
+TEXT_BOMS = (b'\xef\xbb\xbf', b'\xff\xfe', b'\xfe\xff')
+# Control bytes that don't occur in text files (everything below space
+# except tab, line feed, vertical tab, form feed and carriage return)
+BINARY_BYTES = bytes(range(0, 9)) + bytes(range(14, 32))
+# Minimum share of non-binary bytes for a header to count as text
+TEXT_RATIO = 0.9
+
 
 def detect_file_type(file_path):
     """
     Detect the actual file type by reading magic bytes and content.
+    All checks run against a single read of the first few bytes.
     
     Args:
         file_path (str): Path to the file
@@ -34,162 +52,48 @@ def detect_file_type(file_path):
     """
     try:
         with open(file_path, 'rb') as f:
-            header = f.read(8)
-            # Excel files start with PK (ZIP signature)
-            if header[:2] == b'PK':
-                # Verify it's actually a valid Excel file by checking for Excel structure
-                try:
-                    f.seek(0)
-                    # Read more to check for Excel structure
-                    full_header = f.read(50)
-                    # Excel files have specific ZIP structure
-                    if b'xl/' in full_header or b'[Content_Types].xml' in full_header:
-                        return 'excel'
-                except:
-                    pass
-                # If PK but not Excel structure, might be other ZIP file
-                return 'unknown'
-            
-            # CSV files are typically text - check for BOM or text content
-            if header[:3] == b'\xef\xbb\xbf':  # UTF-8 BOM
-                return 'csv'
-            elif header[:2] == b'\xff\xfe' or header[:2] == b'\xfe\xff':  # UTF-16 BOM
-                return 'csv'
-            
-            # Try to read as text to see if it's CSV
-            try:
-                # Try multiple encodings
-                for encoding in ['utf-8', 'latin-1', 'cp1252']:
-                    try:
-                        with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
-                            first_line = f.readline()
-                            # Check if it looks like CSV (has commas, semicolons, or tabs)
-                            if first_line and (',' in first_line or ';' in first_line or '\t' in first_line):
-                                return 'csv'
-                            # If it's readable text but no delimiters, might still be CSV
-                            if first_line and len(first_line.strip()) > 0:
-                                # Check if it's not binary
-                                try:
-                                    first_line.encode('ascii')
-                                    return 'csv'  # Likely CSV if it's readable text
-                                except:
-                                    pass
-                    except:
-                        continue
-            except:
-                pass
+            header = f.read(FILE_HEADER_SIZE)
+        
+        # Excel files start with PK (ZIP signature)
+        if header.startswith(ZIP_SIGNATURE):
+            # Verify it's actually an Excel file by checking for Excel structure
+            if any(marker in header for marker in EXCEL_ZIP_MARKERS):
+                return 'excel'
+            # If PK but not Excel structure, might be other ZIP file
+            return 'unknown'
+        
+        # CSV files are typically text - check for BOM or text content
+        if header.startswith(TEXT_BOMS):
+            return 'csv'
+        
+        # Otherwise it's CSV if the header is (almost) free of the control
+        # bytes that only show up in binary files
+        if not header:
             return 'unknown'
+        text_bytes = header.translate(None, BINARY_BYTES)
+        if len(text_bytes) >= TEXT_RATIO * len(header):
+            return 'csv'
+        return 'unknown'
     except Exception:
         return 'unknown'
 
 
-def read_csv_with_encoding(file_path, nrows=None):
+def is_valid_xlsx(file_path):
     """
-    Read CSV file with automatic encoding detection and robust parsing.
-    Tries multiple encodings and delimiters to handle various CSV formats.
+    Check that a file is an xlsx workbook by looking at its ZIP directory.
+    Only the central directory is read; no worksheet is parsed.
     
     Args:
-        file_path (str): Path to the CSV file
-        nrows (int, optional): Number of rows to read (for testing)
+        file_path (str): Path to the file
     
     Returns:
-        pandas.DataFrame: DataFrame with CSV data
-    
-    Raises:
-        ValueError: If file cannot be read with any method
+        bool: True if the file is a ZIP archive containing xl/workbook.xml
     """
-    encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'windows-1252']
-    delimiters = [',', ';', '\t', '|']
-    
-    # Try different combinations of encoding and delimiter
-    for encoding in encodings:
-        for delimiter in delimiters:
-            try:
-                if nrows:
-                    df = pd.read_csv(
-                        file_path,
-                        encoding=encoding,
-                        delimiter=delimiter,
-                        nrows=nrows,
-                        quotechar='"',
-                        on_bad_lines='skip',  # Skip malformed lines
-                        engine='python',  # Use Python engine for better error handling
-                        skipinitialspace=True
-                    )
-                else:
-                    df = pd.read_csv(
-                        file_path,
-                        encoding=encoding,
-                        delimiter=delimiter,
-                        quotechar='"',
-                        on_bad_lines='skip',  # Skip malformed lines
-                        engine='python',  # Use Python engine for better error handling
-                        skipinitialspace=True
-                    )
-                # If we got here and have data, return it
-                if len(df) > 0 or nrows:
-                    return df
-            except (UnicodeDecodeError, UnicodeError):
-                continue
-            except Exception as e:
-                # If it's not an encoding error, try next delimiter
-                if 'codec' in str(e).lower() or 'decode' in str(e).lower():
-                    continue
-                # For other errors, try next delimiter
-                continue
-    
-    # If all combinations failed, try with most lenient settings (auto-detect separator)
-    for encoding in encodings:
-        try:
-            if nrows:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=encoding,
-                    nrows=nrows,
-                    on_bad_lines='skip',
-                    engine='python',
-                    sep=None,  # Auto-detect separator
-                    skipinitialspace=True
-                )
-            else:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=encoding,
-                    on_bad_lines='skip',
-                    engine='python',
-                    sep=None,  # Auto-detect separator
-                    skipinitialspace=True
-                )
-            if len(df) > 0 or nrows:
-                return df
-        except Exception:
-            continue
-    
-    # Last resort: try with errors='replace'
     try:
-        if nrows:
-            return pd.read_csv(
-                file_path,
-                encoding='utf-8',
-                errors='replace',
-                nrows=nrows,
-                on_bad_lines='skip',
-                engine='python',
-                sep=None,
-                skipinitialspace=True
-            )
-        else:
-            return pd.read_csv(
-                file_path,
-                encoding='utf-8',
-                errors='replace',
-                on_bad_lines='skip',
-                engine='python',
-                sep=None,
-                skipinitialspace=True
-            )
-    except Exception as e:
-        raise ValueError(f"Unable to read CSV file. Error: {str(e)}")
+        with zipfile.ZipFile(file_path) as zf:
+            return XLSX_WORKBOOK_ENTRY in zf.namelist()
+    except (zipfile.BadZipFile, OSError):
+        return False
 
 
 def allowed_file(filename):
@@ -263,7 +167,8 @@ def upload_file():
         input_path = os.path.join(upload_folder, filename)
         file.save(input_path)
         
-        # Detect actual file type and verify file can be read
+        # Detect actual file type and load the file. The loaded DataFrame is
+        # handed to the report generators so the file is only parsed once.
         actual_file_type = detect_file_type(input_path)
         
         # Determine how to read the file
@@ -271,26 +176,33 @@ def upload_file():
         
         try:
             if file_ext == "csv":
-                # Definitely CSV - read as CSV
-                read_csv_with_encoding(input_path, nrows=1)
+                # Definitely CSV
+                df = read_csv_with_encoding(input_path)
                 read_as_csv = True
             elif file_ext in ["xlsx", "xls"]:
                 # Check if it's actually CSV
                 if actual_file_type == "csv":
                     # File is actually CSV, read it as CSV
-                    read_csv_with_encoding(input_path, nrows=1)
+                    df = read_csv_with_encoding(input_path)
                     read_as_csv = True
+                elif actual_file_type == "excel" and file_ext == "xlsx" and not is_valid_xlsx(input_path):
+                    # Looks like a ZIP workbook but has no readable workbook
+                    # entry, so a full Excel parse would fail too. Other
+                    # binary content (e.g. an .xls renamed to .xlsx) is left
+                    # to the Excel reader below.
+                    flash('Invalid or corrupted file. The file is not a valid .xlsx workbook.', 'error')
+                    return redirect(url_for('index'))
                 elif actual_file_type == "excel":
                     # It's Excel, try reading as Excel
                     try:
-                        pd.read_excel(input_path, nrows=1)
+                        df = read_excel_file(input_path)
                         read_as_csv = False
                     except Exception as excel_error:
                         error_msg = str(excel_error).lower()
                         if 'cannot be used in worksheets' in error_msg or 'badzipfile' in error_msg or 'corrupt' in error_msg:
                             # Try CSV as fallback
                             try:
-                                read_csv_with_encoding(input_path, nrows=1)
+                                df = read_csv_with_encoding(input_path)
                                 read_as_csv = True
                             except:
                                 flash(f'Invalid or corrupted file. The file cannot be read as Excel or CSV.', 'error')
@@ -301,14 +213,14 @@ def upload_file():
                 else:
                     # Unknown type - try Excel first, then CSV
                     try:
-                        pd.read_excel(input_path, nrows=1)
+                        df = read_excel_file(input_path)
                         read_as_csv = False
                     except Exception as excel_error:
                         error_msg = str(excel_error).lower()
                         if 'cannot be used in worksheets' in error_msg or 'badzipfile' in error_msg or 'corrupt' in error_msg:
                             # Try CSV as fallback
                             try:
-                                read_csv_with_encoding(input_path, nrows=1)
+                                df = read_csv_with_encoding(input_path)
                                 read_as_csv = True
                             except Exception as csv_error:
                                 flash(f'Invalid file. Cannot read as Excel ({str(excel_error)}) or CSV ({str(csv_error)}).', 'error')
@@ -320,61 +232,42 @@ def upload_file():
             flash(f'Error reading file: {str(e)}. Please ensure the file is valid.', 'error')
             return redirect(url_for('index'))
         
-        # Store the actual file type for report generation
-        # We'll pass this information to the report generators
-        
         # Generate output filename
         base_name = os.path.splitext(filename)[0]
         
-        # If we determined it should be read as CSV but has Excel extension,
-        # create a temporary CSV file so report generators treat it correctly
-        temp_input_path = input_path
-        temp_csv_path = None
+        # The generators receive the parsed DataFrame, so a CSV uploaded with an
+        # Excel extension needs no renamed copy on disk
         if read_as_csv and file_ext in ["xlsx", "xls"]:
-            import shutil
-            temp_csv_path = os.path.join(upload_folder, f"{base_name}_temp.csv")
-            shutil.copy2(input_path, temp_csv_path)
-            temp_input_path = temp_csv_path
-            print(f"File detected as CSV but has {file_ext} extension. Using temporary CSV file: {temp_csv_path}")
+            print(f"File detected as CSV but has {file_ext} extension. Read as CSV.")
         
-        try:
-            if action == 'participation':
-                output_filename = f"{base_name}_participation_report.xlsx"
-                output_path = os.path.join(upload_folder, output_filename)
-                
-                # Generate participation report
-                print(f"Generating participation report: {temp_input_path} -> {output_path} (read_as_csv={read_as_csv})")
-                generate_participation_report(temp_input_path, output_path)
-                
-            elif action == 'performance':
-                output_filename = f"{base_name}_performance_report.xlsx"
-                output_path = os.path.join(upload_folder, output_filename)
-                
-                # Generate performance report
-                print(f"Generating performance report: {temp_input_path} -> {output_path} (read_as_csv={read_as_csv})")
-                generate_performance_report(temp_input_path, output_path)
-        finally:
-            # Clean up temporary CSV file if created
-            if temp_csv_path and os.path.exists(temp_csv_path):
-                try:
-                    os.remove(temp_csv_path)
-                except:
-                    pass
+        # Reports are built in memory and streamed straight to the client,
+        # so nothing is written to or read back from disk
+        output = io.BytesIO()
+        
+        if action == 'participation':
+            output_filename = f"{base_name}_participation_report.xlsx"
+            
+            # Generate participation report
+            print(f"Generating participation report: {input_path} -> {output_filename} (read_as_csv={read_as_csv})")
+            generate_participation_report(df, output)
+            
+        elif action == 'performance':
+            output_filename = f"{base_name}_performance_report.xlsx"
+            
+            # Generate performance report
+            print(f"Generating performance report: {input_path} -> {output_filename} (read_as_csv={read_as_csv})")
+            generate_performance_report(df, output)
         
         if action not in ['participation', 'performance']:
             flash('Invalid action selected.', 'error')
             return redirect(url_for('index'))
         
-        # Verify file was created
-        if not os.path.exists(output_path):
-            raise FileNotFoundError(f"Report file was not created: {output_path}")
-        
-        print(f"Sending file for download: {output_path}")
+        print(f"Sending file for download: {output_filename}")
         
-        # Send file for download using absolute path
-        from flask import Response
+        # Send the in-memory report for download
+        output.seek(0)
         response = send_file(
-            os.path.abspath(output_path),
+            output,
             as_attachment=True,
             download_name=output_filename,
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
@@ -0,0 +1,56 @@
+"""
+Shared Cell Styles
+
+Style objects used by the report generators. openpyxl style descriptors
+are immutable, so a single instance of each is shared by every sheet.
+"""
+
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.utils import get_column_letter
+
+
+# Column letters by 1-based index (COL_LETTERS[1] == 'A'), computed once for
+# every column Excel supports
+COL_LETTERS = [''] + [get_column_letter(i) for i in range(1, 16385)]
+
+
+# Header row: white bold text on dark blue
+HEADER_FILL = PatternFill(start_color="002060", end_color="002060", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+HEADER_ALIGN = Alignment(horizontal="center", vertical="center")
+
+# Thin border around every written cell
+THIN_SIDE = Side(style='thin')
+THIN_BORDER = Border(left=THIN_SIDE, right=THIN_SIDE, top=THIN_SIDE, bottom=THIN_SIDE)
+
+# Background for alternate (even) rows
+ALT_ROW_FILL = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
+
+# Grand Total row
+GT_FILL = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+GT_FONT = Font(bold=True, size=11)
+
+
+def set_column_widths(ws, df, max_width=50):
+    """
+    Size worksheet columns to fit each column's header and longest value.
+    Write-only sheets can't be measured after writing, so the widths come
+    from the DataFrame and must be set before the first row is appended.
+    
+    Args:
+        ws: openpyxl worksheet object
+        df: pandas DataFrame that will be written to the sheet
+        max_width (int): Upper bound for any column width
+    """
+    if len(df) > 0:
+        # One vectorized string-length pass per column, over distinct values
+        # only; empty cells count as zero
+        value_lengths = df.apply(
+            lambda col: col.dropna().drop_duplicates().astype(str).str.len().max()
+        ).fillna(0).to_numpy()
+    else:
+        value_lengths = [0] * len(df.columns)
+    
+    for col_idx, (col_name, length) in enumerate(zip(df.columns, value_lengths), start=1):
+        width = min(max(len(str(col_name)), int(length)) + 2, max_width)
+        ws.column_dimensions[COL_LETTERS[col_idx]].width = width
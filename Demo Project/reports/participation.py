@@ -5,20 +5,99 @@ This module generates a participation report from an Excel file.
 It creates pivot tables and bar charts showing participation by department and test status.
 """
 
+import codecs
+import csv
+import statistics
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook
-from openpyxl.chart import BarChart, Reference
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from reports._styles import set_column_widths, COL_LETTERS, HEADER_FILL, HEADER_FONT, HEADER_ALIGN, THIN_BORDER, ALT_ROW_FILL, GT_FILL, GT_FONT
 
+try:
+    import python_calamine
+except ImportError:
+    # python-calamine is optional; Excel files are read with openpyxl instead
+    python_calamine = None
 
-def read_csv_with_encoding(file_path):
+
+# Largest department x status grid counted with np.bincount; beyond this the
+# dense count array would be wasteful and the pivot falls back to groupby
+_BINCOUNT_MAX_CELLS = 1_000_000
+
+# Number of bytes sampled from the head of a CSV file to detect its format
+_CSV_SAMPLE_SIZE = 64 * 1024
+_CSV_ENCODINGS = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'windows-1252']
+_CSV_DELIMITERS = [',', ';', '\t', '|']
+
+# Lines checked by the delimiter probe, and how much a delimiter's count may
+# vary between them (standard deviation relative to the mean)
+_CSV_PROBE_LINES = 50
+_CSV_PROBE_MAX_VARIATION = 0.1
+
+
+def read_excel_file(file_path, **kwargs):
+    """
+    Read an Excel file, using the Rust-based calamine engine when available.
+    
+    If calamine itself can't open or parse the workbook, it is read again
+    with pandas' default engine (openpyxl). Other errors, such as a missing
+    sheet, are raised straight away.
+    
+    Duration cells (e.g. "[h]:mm:ss") come back as pandas Timedelta values,
+    whose text is "0 days 00:00:00" rather than the "0:00:00" shown in
+    Excel. Callers that compare durations as text should keep this in mind.
+    
+    Args:
+        file_path (str): Path to the Excel file
+        **kwargs: Extra arguments passed to pandas.read_excel
+    
+    Returns:
+        pandas.DataFrame: DataFrame with Excel data
+    """
+    if python_calamine is not None:
+        try:
+            return pd.read_excel(file_path, engine='calamine', **kwargs)
+        except (ImportError, python_calamine.CalamineError):
+            # Engine missing/too old for pandas, or calamine rejected the file
+            pass
+    
+    return pd.read_excel(file_path, **kwargs)
+
+
+def open_excel_file(file_path):
+    """
+    Open an Excel workbook once, so its sheet names can be checked before a
+    sheet is parsed. Uses the calamine engine when available, with the same
+    fallback (and the same type differences) as read_excel_file.
+    
+    Args:
+        file_path (str): Path to the Excel file
+    
+    Returns:
+        pandas.ExcelFile: The opened workbook
+    """
+    if python_calamine is not None:
+        try:
+            return pd.ExcelFile(file_path, engine='calamine')
+        except (ImportError, python_calamine.CalamineError):
+            # Engine missing/too old for pandas, or calamine rejected the file
+            pass
+    
+    return pd.ExcelFile(file_path)
+
+
+def read_csv_with_encoding(file_path, nrows=None):
     """
     Read CSV file with automatic encoding detection and robust parsing.
-    Tries multiple encodings and delimiters to handle various CSV formats.
+    The encoding and delimiter are detected from a sample of the file head so
+    the file is normally parsed only once; if that fails, multiple encodings
+    and delimiters are tried to handle unusual CSV formats.
     
     Args:
         file_path (str): Path to the CSV file
+        nrows (int, optional): Number of rows to read (for testing)
     
     Returns:
         pandas.DataFrame: DataFrame with CSV data
@@ -26,24 +105,148 @@ def read_csv_with_encoding(file_path):
     Raises:
         ValueError: If file cannot be read with any method
     """
-    encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'windows-1252']
-    delimiters = [',', ';', '\t', '|']
+    sniffed = _sniff_csv(file_path)
+    if sniffed is not None:
+        encoding, delimiter = sniffed
+        try:
+            df = _read_csv_fast(file_path, encoding, delimiter, nrows)
+            if len(df) > 0 or nrows:
+                return df
+        except (pd.errors.ParserError, UnicodeDecodeError):
+            # Sample was misleading (e.g. bad bytes further down the file)
+            pass
+    
+    return _read_csv_brute_force(file_path, nrows)
+
+
+def _read_csv_fast(file_path, encoding, delimiter, nrows=None):
+    """
+    Read CSV file with a known encoding and delimiter using the C engine.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        encoding (str): Encoding of the file
+        delimiter (str): Field delimiter
+        nrows (int, optional): Number of rows to read (for testing)
+    
+    Returns:
+        pandas.DataFrame: DataFrame with CSV data
+    """
+    return pd.read_csv(
+        file_path,
+        encoding=encoding,
+        delimiter=delimiter,
+        nrows=nrows,
+        quotechar='"',
+        on_bad_lines='skip',  # Skip malformed lines
+        engine='c',
+        # Parse UTF-8/ASCII straight from the mapped file without an extra decode copy
+        memory_map=encoding in ('utf-8', 'ascii'),
+        low_memory=False,
+        skipinitialspace=True
+    )
+
+
+def _sniff_csv(file_path):
+    """
+    Detect the encoding and delimiter of a CSV file from a sample of its head.
+    
+    Args:
+        file_path (str): Path to the CSV file
+    
+    Returns:
+        tuple: (encoding, delimiter), or None if the sample is inconclusive
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(_CSV_SAMPLE_SIZE)
+    if not sample:
+        return None
+    
+    for encoding in _CSV_ENCODINGS:
+        try:
+            # Decode incrementally so a multi-byte character cut off at the
+            # end of the sample is not mistaken for an encoding error
+            text = codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        return None
+    
+    # Drop the (probably truncated) last line before sniffing
+    if len(sample) == _CSV_SAMPLE_SIZE and '\n' in text:
+        text = text[:text.rindex('\n')]
+    
+    try:
+        dialect = csv.Sniffer().sniff(text, delimiters=''.join(_CSV_DELIMITERS))
+    except csv.Error:
+        # The sniffer gives up on e.g. irregular quoting; a plain count of
+        # each delimiter per line is usually still conclusive
+        delimiter = _probe_delimiter(text)
+        if delimiter is None:
+            return None
+        return encoding, delimiter
+    return encoding, dialect.delimiter
+
+
+def _probe_delimiter(text):
+    """
+    Pick the delimiter that occurs a consistent number of times per line.
+    Single pass over a bounded sample, so a file the sniffer can't handle
+    does not have to be parsed once per encoding and delimiter.
+    
+    Args:
+        text (str): Decoded sample from the head of the file
+    
+    Returns:
+        str: The most consistent delimiter, or None if none is consistent
+    """
+    lines = [line for line in text.splitlines()[:_CSV_PROBE_LINES] if line.strip()]
+    
+    best_delimiter = None
+    best_variation = _CSV_PROBE_MAX_VARIATION
+    for delimiter in _CSV_DELIMITERS:
+        counts = [line.count(delimiter) for line in lines]
+        if not counts or max(counts) == 0:
+            continue
+        variation = statistics.pstdev(counts) / max(statistics.mean(counts), 1)
+        if variation < best_variation:
+            best_delimiter = delimiter
+            best_variation = variation
+    return best_delimiter
+
+
+def _read_csv_brute_force(file_path, nrows=None):
+    """
+    Read CSV file by trying every combination of encoding and delimiter.
+    Used when the format cannot be detected from a sample of the file.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        nrows (int, optional): Number of rows to read (for testing)
     
+    Returns:
+        pandas.DataFrame: DataFrame with CSV data
+    
+    Raises:
+        ValueError: If file cannot be read with any method
+    """
     # Try different combinations of encoding and delimiter
-    for encoding in encodings:
-        for delimiter in delimiters:
+    for encoding in _CSV_ENCODINGS:
+        for delimiter in _CSV_DELIMITERS:
             try:
                 df = pd.read_csv(
                     file_path,
                     encoding=encoding,
                     delimiter=delimiter,
+                    nrows=nrows,
                     quotechar='"',
                     on_bad_lines='skip',  # Skip malformed lines
                     engine='python',  # Use Python engine for better error handling
                     skipinitialspace=True
                 )
                 # If we got here and have data, return it
-                if len(df) > 0:
+                if len(df) > 0 or nrows:
                     return df
             except (UnicodeDecodeError, UnicodeError):
                 continue
@@ -55,17 +258,18 @@ def read_csv_with_encoding(file_path):
                 continue
     
     # If all combinations failed, try with most lenient settings (auto-detect separator)
-    for encoding in encodings:
+    for encoding in _CSV_ENCODINGS:
         try:
             df = pd.read_csv(
                 file_path,
                 encoding=encoding,
+                nrows=nrows,
                 on_bad_lines='skip',
                 engine='python',
                 sep=None,  # Auto-detect separator
                 skipinitialspace=True
             )
-            if len(df) > 0:
+            if len(df) > 0 or nrows:
                 return df
         except Exception:
             continue
@@ -76,6 +280,7 @@ def read_csv_with_encoding(file_path):
             file_path,
             encoding='utf-8',
             errors='replace',
+            nrows=nrows,
             on_bad_lines='skip',
             engine='python',
             sep=None,
@@ -89,12 +294,78 @@ def generate_participation_report(input_file, output_file):
     """
     Generate a participation report with pivot tables and charts.
     
+    Args:
+        input_file (str or pandas.DataFrame): Path to the input file (CSV, XLSX,
+            or XLS), or a DataFrame already loaded from it
+        output_file (str or file-like): Path or binary stream to save the
+            output Excel file to
+    
+    Returns:
+        str or file-like: The output_file argument
+    """
+    if isinstance(input_file, pd.DataFrame):
+        # Caller already parsed the file, don't read it again
+        df = input_file
+    else:
+        df = load_input_file(input_file)
+    
+    # Create a new write-only workbook: rows are streamed to the file as they
+    # are appended instead of being kept in memory until save
+    wb = Workbook(write_only=True)
+    ws_data = wb.create_sheet("Data")
+    
+    # Write styled data to sheet
+    _write_data_to_sheet(ws_data, df)
+    
+    # Create Participation Summary sheet with pivot table and bar chart
+    add_participation_summary(wb, df)
+    
+    # Save workbook
+    wb.save(output_file)
+    return output_file
+
+
+def add_participation_summary(wb, df, pivot_df=None):
+    """
+    Add the Participation Summary sheet (pivot table and bar chart) to a
+    workbook. Lets other reports include the summary in the workbook they
+    are building instead of generating and reloading a participation report.
+    
+    Args:
+        wb: openpyxl write-only Workbook
+        df: pandas DataFrame with the uploaded data
+        pivot_df: Pivot table from create_participation_pivot(df), if the
+            caller already built it
+    
+    Returns:
+        openpyxl worksheet: The new Participation Summary sheet
+    """
+    # Create pivot table
+    if pivot_df is None:
+        pivot_df = create_participation_pivot(df)
+    
+    # Create Participation Summary sheet
+    ws_summary = wb.create_sheet("Participation Summary")
+    _write_pivot_to_sheet(ws_summary, pivot_df, "Participation Summary")
+    
+    # Add bar chart
+    _add_participation_chart(ws_summary, pivot_df)
+    
+    return ws_summary
+
+
+def load_input_file(input_file):
+    """
+    Read the input file into a DataFrame based on its extension.
+    
     Args:
         input_file (str): Path to the input file (CSV, XLSX, or XLS)
-        output_file (str): Path to save the output Excel file
     
     Returns:
-        str: Path to the generated output file
+        pandas.DataFrame: Data from the input file
+    
+    Raises:
+        ValueError: If the file cannot be read
     """
     # Detect file extension and read accordingly
     file_ext = input_file.lower().split('.')[-1]
@@ -103,7 +374,7 @@ def generate_participation_report(input_file, output_file):
         df = read_csv_with_encoding(input_file)
     elif file_ext in ["xlsx", "xls"]:
         try:
-            df = pd.read_excel(input_file)
+            df = read_excel_file(input_file)
         except Exception as e:
             error_msg = str(e).lower()
             # Check if it's a corrupted/invalid Excel file - try CSV as fallback
@@ -119,96 +390,49 @@ def generate_participation_report(input_file, output_file):
     else:
         raise ValueError("Unsupported file format. Please upload CSV or Excel files.")
     
-    # Create a new workbook
-    wb = Workbook()
-    ws_data = wb.active
-    ws_data.title = "Data"
-    
-    # Write data to sheet
-    _write_data_to_sheet(ws_data, df)
-    
-    # Apply styling to Data sheet
-    _style_data_sheet(ws_data, df)
-    
-    # Create pivot table
-    pivot_df = _create_participation_pivot(df)
-    
-    # Create Participation Summary sheet
-    ws_summary = wb.create_sheet("Participation Summary")
-    _write_pivot_to_sheet(ws_summary, pivot_df, "Participation Summary")
-    
-    # Add bar chart
-    _add_participation_chart(ws_summary, pivot_df)
-    
-    # Save workbook
-    wb.save(output_file)
-    return output_file
+    return df
 
 
 def _write_data_to_sheet(ws, df):
     """
-    Write DataFrame data to worksheet.
+    Write DataFrame data to a write-only worksheet with styling.
+    Only the header row is styled per cell; body rows are banded by a
+    conditional formatting rule.
     
     Args:
-        ws: openpyxl worksheet object
+        ws: openpyxl write-only worksheet object
         df: pandas DataFrame
     """
-    # Write headers
-    for col_idx, col_name in enumerate(df.columns, start=1):
-        ws.cell(row=1, column=col_idx, value=col_name)
-    
-    # Write data
-    for row_idx, row_data in enumerate(df.values, start=2):
-        for col_idx, value in enumerate(row_data, start=1):
-            ws.cell(row=row_idx, column=col_idx, value=value)
-
-
-def _style_data_sheet(ws, df):
-    """
-    Apply styling to the data sheet.
-    
-    Args:
-        ws: openpyxl worksheet object
-        df: pandas DataFrame
-    """
-    # Header styling
-    header_fill = PatternFill(start_color="002060", end_color="002060", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    # Apply header styling
-    for col_idx, col_name in enumerate(df.columns, start=1):
-        cell = ws.cell(row=1, column=col_idx)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.border = thin_border
-    
-    # Apply data styling and borders
-    for row_idx in range(2, len(df) + 2):
-        for col_idx in range(1, len(df.columns) + 1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.border = thin_border
-            # Alternate row coloring
-            if row_idx % 2 == 0:
-                cell.fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-    
-    # Auto-adjust column widths
-    for col_idx, col_name in enumerate(df.columns, start=1):
-        max_length = max(
-            len(str(col_name)),
-            df[col_name].astype(str).map(len).max() if len(df) > 0 else 0
+    # Auto-adjust column widths (must be set before any row is written)
+    set_column_widths(ws, df)
+    
+    # Write styled headers
+    header_cells = []
+    for col_name in df.columns:
+        cell = WriteOnlyCell(ws, value=col_name)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGN
+        cell.border = THIN_BORDER
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    # Write data as plain values; itertuples avoids building an object array
+    # of the whole frame
+    for row_data in df.itertuples(index=False, name=None):
+        ws.append(row_data)
+    
+    # Alternate row coloring as a single conditional formatting rule instead
+    # of styling every body cell
+    if len(df) > 0 and len(df.columns) > 0:
+        data_range = f"A2:{COL_LETTERS[len(df.columns)]}{len(df) + 1}"
+        ws.conditional_formatting.add(
+            data_range,
+            FormulaRule(formula=['MOD(ROW(),2)=0'], fill=ALT_ROW_FILL)
         )
-        ws.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 2, 50)
 
 
-def _create_participation_pivot(df):
+def create_participation_pivot(df):
     """
     Create a pivot table for participation report.
     
@@ -218,48 +442,58 @@ def _create_participation_pivot(df):
     Returns:
         pandas DataFrame: Pivot table
     """
-    # Find Department and Test Status columns (case-insensitive)
-    dept_col = None
-    status_col = None
+    # Lowercase the column names once and match them in vectorized passes
+    cols_lower = df.columns.astype(str).str.lower()
     
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if 'department' in col_lower:
-            dept_col = col
-        if 'test status' in col_lower or 'status' in col_lower:
-            status_col = col
+    # Find Department and Test Status columns (case-insensitive)
+    dept_matches = df.columns[cols_lower.str.contains('department', regex=False)]
+    status_matches = df.columns[cols_lower.str.contains('status', regex=False)]
     
-    if dept_col is None or status_col is None:
+    if len(dept_matches) == 0 or len(status_matches) == 0:
         raise ValueError("Required columns 'Department' and 'Test Status' not found in the Excel file")
     
+    # The last matching column is used for both
+    dept_col = dept_matches[-1]
+    status_col = status_matches[-1]
+    
     # Find Name column for counting (or use first column)
-    name_col = None
-    for col in df.columns:
-        if 'name' in str(col).lower():
-            name_col = col
-            break
+    name_matches = df.columns[cols_lower.str.contains('name', regex=False)]
+    name_col = name_matches[0] if len(name_matches) > 0 else df.columns[0]
+    
+    # Group on categorical keys so rows are grouped by integer codes instead
+    # of hashing every string. The caller's DataFrame is left untouched.
+    dept_keys = df[dept_col].astype('category')
+    status_keys = df[status_col].astype('category')
+    
+    # Count names per department and status
+    n_dept = len(dept_keys.cat.categories)
+    n_status = len(status_keys.cat.categories)
+    if n_dept * n_status <= _BINCOUNT_MAX_CELLS:
+        pivot_df = _count_pivot_bincount(dept_keys, status_keys, df[name_col].notna())
+    else:
+        pivot_df = (
+            df.groupby([dept_keys, status_keys], observed=True)[name_col]
+            .count()
+            .unstack(fill_value=0)
+        )
     
-    if name_col is None:
-        # Use first column as fallback
-        name_col = df.columns[0]
-    
-    # Create pivot table with Grand Total row and column
-    pivot_df = pd.pivot_table(
-        df,
-        index=dept_col,
-        columns=status_col,
-        values=name_col,
-        aggfunc='count',
-        fill_value=0,
-        margins=True,
-        margins_name="Grand Total"
-    )
+    # Categorical labels can't take new entries; use plain ones for the totals
+    pivot_df.index = pivot_df.index.astype(object)
+    pivot_df.columns = pivot_df.columns.astype(object)
+    
+    # Add Grand Total column and row as sums of the table. Rows with a blank
+    # department or status are not in any cell, and pivot_table (dropna=True)
+    # dropped them before its margins too, so the totals are the same as the
+    # pivot_table margins this replaced.
+    pivot_df['Grand Total'] = pivot_df.sum(axis=1)
+    pivot_df.loc['Grand Total'] = pivot_df.sum(axis=0)
     
     # Reset index to make Department a column
     pivot_df = pivot_df.reset_index()
     
     # Remove any unnamed columns (blank columns that might appear)
-    pivot_df = pivot_df.loc[:, ~pivot_df.columns.str.contains('^Unnamed', na=False)]
+    keep = [not (isinstance(col, str) and col.startswith('Unnamed')) for col in pivot_df.columns]
+    pivot_df = pivot_df.loc[:, keep]
     
     # Get the department column name (first column after reset_index)
     dept_col_name = pivot_df.columns[0]
@@ -284,60 +518,90 @@ def _create_participation_pivot(df):
     return pivot_df
 
 
+def _count_pivot_bincount(dept_keys, status_keys, counted):
+    """
+    Count rows per (department, status) pair from categorical codes.
+    
+    Each pair is flattened to a single integer so np.bincount does the whole
+    count in one pass. The result matches a groupby count with observed=True:
+    rows with a missing key are dropped and only departments/statuses that
+    occur together in at least one row are kept.
+    
+    Args:
+        dept_keys: Categorical Series of departments
+        status_keys: Categorical Series of statuses
+        counted: Boolean Series, True for rows that add to the count
+    
+    Returns:
+        pandas DataFrame: Counts indexed by department, one column per status
+    """
+    dept_codes = dept_keys.cat.codes.to_numpy()
+    status_codes = status_keys.cat.codes.to_numpy()
+    n_dept = len(dept_keys.cat.categories)
+    n_status = len(status_keys.cat.categories)
+    
+    # Missing values have code -1
+    valid = (dept_codes >= 0) & (status_codes >= 0)
+    flat = dept_codes[valid].astype(np.int64) * n_status + status_codes[valid]
+    size = n_dept * n_status
+    
+    counts = np.bincount(flat, weights=counted.to_numpy()[valid], minlength=size)
+    counts = counts.astype(np.int64).reshape(n_dept, n_status)
+    seen = np.bincount(flat, minlength=size).reshape(n_dept, n_status) > 0
+    
+    # Keep only labels that were observed together with a valid partner
+    dept_seen = seen.any(axis=1)
+    status_seen = seen.any(axis=0)
+    return pd.DataFrame(
+        counts[np.ix_(dept_seen, status_seen)],
+        index=pd.Index(dept_keys.cat.categories[dept_seen], name=dept_keys.name),
+        columns=pd.Index(status_keys.cat.categories[status_seen], name=status_keys.name),
+    )
+
+
 def _write_pivot_to_sheet(ws, pivot_df, title):
     """
     Write pivot table data to worksheet with styling.
     
     Args:
-        ws: openpyxl worksheet object
+        ws: openpyxl write-only worksheet object
         pivot_df: pandas DataFrame (pivot table)
         title: Sheet title
     """
-    # Write headers
-    header_fill = PatternFill(start_color="002060", end_color="002060", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    for col_idx, col_name in enumerate(pivot_df.columns, start=1):
-        cell = ws.cell(row=1, column=col_idx)
-        cell.value = str(col_name)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.border = thin_border
-    
-    # Write data
-    for row_idx, row_data in enumerate(pivot_df.values, start=2):
+    # Auto-adjust column widths (must be set before any row is written)
+    set_column_widths(ws, pivot_df)
+    
+    header_cells = []
+    for col_name in pivot_df.columns:
+        cell = WriteOnlyCell(ws, value=str(col_name))
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGN
+        cell.border = THIN_BORDER
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    # Write data; itertuples yields native Python values without an object
+    # array of the whole table
+    for row_idx, row_data in enumerate(pivot_df.itertuples(index=False, name=None), start=2):
         # Check if this is the Grand Total row (last row)
         is_grand_total_row = (row_idx == len(pivot_df) + 1)
         
-        for col_idx, value in enumerate(row_data, start=1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.value = value
-            cell.border = thin_border
+        row_cells = []
+        for value in row_data:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.border = THIN_BORDER
             
             if is_grand_total_row:
                 # Style Grand Total row with bold font and different background
-                cell.font = Font(bold=True, size=11)
-                cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+                cell.font = GT_FONT
+                cell.fill = GT_FILL
             else:
                 # Alternate row coloring for regular rows
                 if row_idx % 2 == 0:
-                    cell.fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-    
-    # Auto-adjust column widths
-    for col_idx, col_name in enumerate(pivot_df.columns, start=1):
-        max_length = max(
-            len(str(col_name)),
-            pivot_df[col_name].astype(str).map(len).max() if len(pivot_df) > 0 else 0
-        )
-        ws.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 2, 50)
+                    cell.fill = ALT_ROW_FILL
+            row_cells.append(cell)
+        ws.append(row_cells)
 
 
 def _add_participation_chart(ws, pivot_df):
@@ -350,6 +614,8 @@ def _add_participation_chart(ws, pivot_df):
         ws: openpyxl worksheet object
         pivot_df: pandas DataFrame (pivot table with Grand Total row)
     """
+    # Chart modules are only needed here, so they're imported on first use
+    from openpyxl.chart import BarChart, Reference
     from openpyxl.chart.label import DataLabelList
     from openpyxl.chart.text import RichText
     
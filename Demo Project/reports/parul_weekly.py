@@ -6,65 +6,43 @@ according to the specified business rules.
 """
 
 import os
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-from openpyxl import load_workbook
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
 from openpyxl.chart import BarChart, Reference
 from openpyxl.chart.label import DataLabelList
 from openpyxl.chart.shapes import GraphicalProperties
-
-
-def read_csv_with_encoding(file_path):
-    """
-    Read CSV file with automatic encoding detection and robust parsing.
-    """
-    encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'windows-1252']
-    delimiters = [',', ';', '\t', '|']
-
-    for encoding in encodings:
-        for delimiter in delimiters:
-            try:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=encoding,
-                    delimiter=delimiter,
-                    quotechar='"',
-                    on_bad_lines='skip',
-                    engine='python',
-                    skipinitialspace=True
-                )
-                if len(df) > 0:
-                    return df
-            except (UnicodeDecodeError, UnicodeError):
-                continue
-            except Exception:
-                continue
-
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(
-                file_path,
-                encoding=encoding,
-                on_bad_lines='skip',
-                engine='python',
-                sep=None,
-                skipinitialspace=True
-            )
-            if len(df) > 0:
-                return df
-        except Exception:
-            continue
-
-    return pd.read_csv(
-        file_path,
-        encoding='utf-8',
-        errors='replace',
-        on_bad_lines='skip',
-        engine='python',
-        sep=None,
-        skipinitialspace=True
-    )
+from reports._styles import set_column_widths
+from reports.participation import open_excel_file, read_csv_with_encoding
+
+# Shared cell styles; built once and reused for every cell
+_THIN_SIDE = Side(style='thin', color="000000")
+_THIN_BORDER = Border(left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE)
+_CENTER_ALIGN = Alignment(horizontal="center", vertical="center")
+_HEADER_FILL = PatternFill(start_color="1E4E79", end_color="1E4E79", fill_type="solid")
+_HEADER_FONT = Font(color="FFFFFF", bold=True)
+_TOTAL_FILL = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+_TOTAL_FONT = Font(bold=True)
+# Lighter header and total row used by the Attempt Status table
+_LIGHT_HEADER_FILL = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+_LIGHT_HEADER_FONT = Font(color="000000", bold=True)
+_LIGHT_TOTAL_FILL = PatternFill(start_color="E9EDF5", end_color="E9EDF5", fill_type="solid")
+
+# Fixed label sets of the derived columns, stored as categoricals so the
+# summaries group on integer codes
+_PORTAL_STATUS_LABELS = ['Activated', 'Not Activated']
+_ATTEMPT_STATUS_LABELS = ['Successful Attempt', 'Unsuccessful Attempt', 'No Attempt']
+_CATEGORY_LABELS = [
+    'Good (75%+)',
+    'Satisfactory (50% - 75%)',
+    'Needs Attention (25% - 50%)',
+    'Intervention (0% - 25%)',
+    'Not Started',
+    'Invalid Score',
+]
 
 
 def generate_parul_weekly_report(input_file, output_file):
@@ -91,10 +69,11 @@ def _load_overall_data(input_file):
         return read_csv_with_encoding(input_file)
 
     try:
-        return pd.read_excel(input_file, sheet_name='Overall Data')
-    except ValueError:
-        # If the sheet does not exist, load the first sheet
-        return pd.read_excel(input_file)
+        # Open the workbook once and load the first sheet if there is no
+        # Overall Data sheet
+        with open_excel_file(input_file) as excel_file:
+            sheet_name = 'Overall Data' if 'Overall Data' in excel_file.sheet_names else 0
+            return excel_file.parse(sheet_name=sheet_name)
     except Exception as e:
         # Attempt to read as CSV if Excel read fails
         try:
@@ -106,25 +85,28 @@ def _load_overall_data(input_file):
 def _process_overall_data(df):
     """
     Apply the Parul Weekly transformations to the Overall Data sheet.
-    """
-    df = df.copy()
 
-    name_col = _get_column(df, ['name'])
-    test_status_col = _get_column(df, ['test', 'status'])
-    test_duration_col = _get_column(df, ['test', 'duration'])
+    The derived columns are added with assign(), which returns a new
+    DataFrame, so the caller's frame is left unchanged without a deep copy.
+    """
+    columns = _col_index(df)
+    name_col = _get_column(columns, ['name'])
+    test_status_col = _get_column(columns, ['test', 'status'])
+    test_duration_col = _get_column(columns, ['test', 'duration'])
 
-    max_score_col = _get_column(df, ['max', 'score'])
+    max_score_col = _get_column(columns, ['max', 'score'])
     base_prefix = max_score_col[:max_score_col.lower().rfind('max score')].strip()
-    student_score_col = _find_related_column(df, base_prefix, 'student score')
-    total_percentage_col = _find_related_column(df, base_prefix, 'total percentage')
+    student_score_col = _find_related_column(columns, base_prefix, 'student score')
+    total_percentage_col = _find_related_column(columns, base_prefix, 'total percentage')
 
     # Portal Status column
     portal_status_col = 'Portal Status'
-    df[portal_status_col] = df[name_col].apply(_compute_portal_status)
+    portal_status = _compute_portal_status(_stripped_text(df[name_col]))
 
     # Attempt Status column
     attempt_status_col = 'Attempt Status'
-    df[attempt_status_col] = df[test_duration_col].apply(_compute_attempt_status)
+    test_duration = df[test_duration_col]
+    attempt_status = _compute_attempt_status(test_duration, _stripped_text(test_duration))
 
     # Order of key columns
     key_columns = [
@@ -138,9 +120,15 @@ def _process_overall_data(df):
 
     # Category column (placed after total percentage)
     category_col = 'Category'
-    df[category_col] = df[total_percentage_col].apply(_categorize_performance)
+    category = _categorize_performance(df[total_percentage_col])
     key_columns.append(category_col)
 
+    df = df.assign(**{
+        portal_status_col: pd.Categorical(portal_status, categories=_PORTAL_STATUS_LABELS),
+        attempt_status_col: pd.Categorical(attempt_status, categories=_ATTEMPT_STATUS_LABELS),
+        category_col: pd.Categorical(category, categories=_CATEGORY_LABELS, ordered=True),
+    })
+
     ordered_cols = [col for col in key_columns if col in df.columns]
     remaining_cols = [col for col in df.columns if col not in ordered_cols]
     df = df[ordered_cols + remaining_cols]
@@ -148,137 +136,210 @@ def _process_overall_data(df):
     return df
 
 
-def _compute_portal_status(value):
-    value_str = str(value).strip()
-    return 'Not Activated' if value_str == '-' else 'Activated'
+def _stripped_text(values):
+    """
+    Convert a column to text with surrounding whitespace removed, in one
+    vectorized pass that the classifiers below share.
+    """
+    return values.astype(str).str.strip()
+
 
+def _compute_portal_status(value_str):
+    """
+    Portal status for each row: a '-' name means the portal was never activated.
 
-def _compute_attempt_status(value):
-    value_str = '' if pd.isna(value) else str(value).strip()
-    if value_str in ('', '-'):
-        return 'No Attempt'
-    if value_str == '0:00:00':
-        return 'Unsuccessful Attempt'
-    return 'Successful Attempt'
+    Takes the name column as stripped text (see _stripped_text).
+    """
+    return np.where(value_str == '-', 'Not Activated', 'Activated')
 
 
-def _categorize_performance(value):
-    if pd.isna(value):
-        return 'Not Started'
+def _compute_attempt_status(values, value_str):
+    """
+    Attempt status for each row, derived from the test duration.
 
-    value_str = str(value).strip().replace('%', '')
-    if value_str in ('', '-'):
-        return 'Not Started'
+    Takes the raw duration column, for missing values, and the same column
+    as stripped text. Only the exact text '0:00:00' is an unsuccessful
+    attempt; durations read from Excel as timedeltas print as
+    '0 days 00:00:00' and, like CSV text '00:00:00', count as successful.
+    """
+    no_attempt = values.isna() | value_str.isin(['', '-'])
+    return np.select(
+        [no_attempt, value_str == '0:00:00'],
+        ['No Attempt', 'Unsuccessful Attempt'],
+        default='Successful Attempt'
+    )
 
-    try:
-        score = float(value_str)
-        if score > 1:
-            score = score / 100.0
-    except ValueError:
-        return 'Invalid Score'
-
-    if score >= 0.75:
-        return 'Good (75%+)'
-    if score >= 0.50:
-        return 'Satisfactory (50% - 75%)'
-    if score >= 0.25:
-        return 'Needs Attention (25% - 50%)'
-    if score >= 0:
-        return 'Intervention (0% - 25%)'
-    return 'Invalid Score'
+
+def _categorize_performance(values):
+    """
+    Performance category for each row, derived from the total percentage.
+
+    Percentages may be fractions (0.8) or whole numbers with or without a
+    '%' sign (80, '80%'). Blank or '-' means not started; anything that
+    isn't a number, or is negative, is an invalid score.
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return _categorize_numeric_performance(values)
+
+    value_str = _stripped_text(values).str.replace('%', '', regex=False)
+    not_started = values.isna() | value_str.isin(['', '-'])
+
+    score = pd.to_numeric(value_str.str.strip(), errors='coerce')
+    score = score.where(score <= 1, score / 100.0)
+
+    return np.select(
+        [
+            not_started,
+            score >= 0.75,
+            score >= 0.50,
+            score >= 0.25,
+            score >= 0,
+        ],
+        [
+            'Not Started',
+            'Good (75%+)',
+            'Satisfactory (50% - 75%)',
+            'Needs Attention (25% - 50%)',
+            'Intervention (0% - 25%)',
+        ],
+        default='Invalid Score'
+    )
+
+
+def _categorize_numeric_performance(values):
+    """
+    Fast path of _categorize_performance for an already numeric column.
+
+    Skips the string cleanup and buckets the scores with np.digitize.
+    """
+    score = values.to_numpy(dtype=float, na_value=np.nan)
+    score = np.where(score > 1, score / 100.0, score)
+
+    # Bucket 0 is below zero, then one bucket per 25% band
+    labels = np.array([
+        'Invalid Score',
+        'Intervention (0% - 25%)',
+        'Needs Attention (25% - 50%)',
+        'Satisfactory (50% - 75%)',
+        'Good (75%+)',
+    ], dtype=object)
+    buckets = np.digitize(score, [0, 0.25, 0.50, 0.75])
+    return np.where(np.isnan(score), 'Not Started', labels[buckets])
 
 
 def _write_formatted_workbook(df, output_file):
     """
-    Write the processed DataFrame to Excel and apply formatting.
+    Write the processed DataFrame and summary sheets to a formatted workbook.
+    The workbook is always new, so the _add_* builders create their sheets
+    without checking for existing ones.
+
+    Rows are streamed into a write-only workbook with their styles set as
+    they are emitted, so the file is serialized exactly once.
     """
     output_dir = os.path.dirname(output_file)
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir, exist_ok=True)
 
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Overall Data', index=False)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Overall Data')
 
-    wb = load_workbook(output_file)
-    ws = wb['Overall Data']
-
-    header_fill = PatternFill(start_color="1E4E79", end_color="1E4E79", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    center_alignment = Alignment(horizontal="center", vertical="center")
-    thin_side = Side(style='thin', color="000000")
-    thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
+    # Auto-adjust column widths (must be set before any row is written)
+    set_column_widths(ws, df, 60)
 
     # Header formatting
-    for col_idx in range(1, ws.max_column + 1):
-        cell = ws.cell(row=1, column=col_idx)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = thin_border
-
-    # Body formatting and borders
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row, max_col=ws.max_column):
-        for cell in row:
-            cell.border = thin_border
-
-    # Center-align key columns
-    key_columns = {'Portal Status', 'Attempt Status', 'Category'}
+    header_cells = []
     for col_name in df.columns:
-        if col_name in key_columns or 'test status' in col_name.lower():
-            col_idx = df.columns.get_loc(col_name) + 1
-            for row_idx in range(2, ws.max_row + 1):
-                ws.cell(row=row_idx, column=col_idx).alignment = center_alignment
-
-    # Auto-adjust column widths
-    for column_cells in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column_cells[0].column)
-        for cell in column_cells:
-            try:
-                cell_length = len(str(cell.value)) if cell.value is not None else 0
-                if cell_length > max_length:
-                    max_length = cell_length
-            except Exception:
-                continue
-        ws.column_dimensions[column_letter].width = min(max_length + 2, 60)
+        cell = WriteOnlyCell(ws, value=col_name)
+        cell.fill = _HEADER_FILL
+        cell.font = _HEADER_FONT
+        cell.alignment = _CENTER_ALIGN
+        cell.border = _THIN_BORDER
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    # Body borders, with key columns center-aligned
+    key_columns = {'Portal Status', 'Attempt Status', 'Category'}
+    centered = [
+        col_name in key_columns or 'test status' in col_name.lower()
+        for col_name in df.columns
+    ]
+    for row_data in df.itertuples(index=False, name=None):
+        row_cells = []
+        for value, is_centered in zip(row_data, centered):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.border = _THIN_BORDER
+            if is_centered:
+                cell.alignment = _CENTER_ALIGN
+            row_cells.append(cell)
+        ws.append(row_cells)
 
     # Add Div Wise Performance Summary sheet
-    _add_div_wise_performance_summary(wb, df)
-    # Add Overall Performance Summary sheet
-    _add_overall_performance_summary(wb, df)
+    category_totals = _add_div_wise_performance_summary(wb, df)
+    # Add Overall Performance Summary sheet (from the div wise counts)
+    _add_overall_performance_summary(wb, category_totals)
     # Add Div Wise Participation Summary sheet
-    _add_div_wise_participation_summary(wb, df)
-    # Add Overall Participation Summary sheet
-    _add_overall_participation_summary(wb, df)
+    status_totals = _add_div_wise_participation_summary(wb, df)
+    # Add Overall Participation Summary sheet (from the div wise counts)
+    _add_overall_participation_summary(wb, status_totals)
     # Add Attempt Status Summary sheet
     _add_attempt_status_summary(wb, df)
 
     wb.save(output_file)
 
 
-def _get_column(df, keywords):
+def _col_index(df):
+    """
+    Map each normalized (stripped, lowercased) column name to its column.
+
+    The mapping is cached per set of column names, so the builders that all
+    look at the same processed frame normalize its names only once. When two
+    names normalize the same way the first column wins. Callers must not
+    modify the returned dict.
+    """
+    return _normalized_columns(tuple(df.columns))
+
+
+@lru_cache(maxsize=16)
+def _normalized_columns(columns):
+    """
+    Build the normalized name to column mapping for _col_index.
+
+    The cache is keyed on the tuple of column names, so frames with the
+    same columns share one mapping.
+
+    Args:
+        columns (tuple): Column names of the DataFrame
+
+    Returns:
+        dict: Normalized (stripped, lowercased) name to original column name
+    """
+    col_index = {}
+    for col in columns:
+        col_index.setdefault(str(col).strip().lower(), col)
+    return col_index
+
+
+def _get_column(col_index, keywords):
     """
     Find the first column whose name contains all provided keywords.
     """
-    for col in df.columns:
-        col_lower = str(col).lower()
+    for col_lower, col in col_index.items():
         if all(keyword in col_lower for keyword in keywords):
             return col
     raise ValueError(f"Required column containing keywords {keywords} not found.")
 
 
-def _match_exact_column(df, target_col_name):
+def _match_exact_column(col_index, target_col_name):
     """
     Find a column that matches the target name case-insensitively.
     """
-    target_lower = target_col_name.lower()
-    for col in df.columns:
-        if str(col).lower() == target_lower:
-            return col
-    raise ValueError(f"Expected column '{target_col_name}' not found in the dataset.")
+    col = col_index.get(target_col_name.strip().lower())
+    if col is None:
+        raise ValueError(f"Expected column '{target_col_name}' not found in the dataset.")
+    return col
 
 
-def _find_related_column(df, base_prefix, suffix):
+def _find_related_column(col_index, base_prefix, suffix):
     """
     Find a column that shares the base prefix and ends with the given suffix.
     """
@@ -287,14 +348,11 @@ def _find_related_column(df, base_prefix, suffix):
     exact_name = f"{base_prefix} {suffix}".strip().lower()
 
     # First, look for an exact match (with or without extra spaces)
-    for col in df.columns:
-        col_lower = str(col).strip().lower()
-        if col_lower == exact_name:
-            return col
+    if exact_name in col_index:
+        return col_index[exact_name]
 
     candidates = []
-    for col in df.columns:
-        col_lower = str(col).strip().lower()
+    for col_lower, col in col_index.items():
         if col_lower.endswith(suffix_lower):
             leading = col_lower[:-len(suffix_lower)].rstrip()
             if base_lower and leading == base_lower:
@@ -313,14 +371,16 @@ def _find_related_column(df, base_prefix, suffix):
 def _add_div_wise_performance_summary(wb, df):
     """
     Create the Div Wise Performance Summary sheet with pivot and chart.
+
+    Returns the count per category over all rows, including rows without a
+    department, for the Overall Performance Summary.
     """
     sheet_name = 'Div Wise Performance Summary'
-    if sheet_name in wb.sheetnames:
-        del wb[sheet_name]
     ws = wb.create_sheet(sheet_name)
 
-    dept_col = _get_column(df, ['department'])
-    category_col = _match_exact_column(df, 'Category')
+    columns = _col_index(df)
+    dept_col = _get_column(columns, ['department'])
+    category_col = _match_exact_column(columns, 'Category')
     count_col = _get_count_column(df)
 
     category_order = [
@@ -331,34 +391,37 @@ def _add_div_wise_performance_summary(wb, df):
         'Not Started',
     ]
 
-    pivot_df = pd.pivot_table(
-        df,
-        index=dept_col,
-        columns=category_col,
-        values=count_col,
-        aggfunc='count',
-        fill_value=0
+    # Direct groupby count; rows with an empty count column are not counted.
+    # Rows without a department are kept here for the overall totals.
+    counts = (
+        df.groupby([dept_col, category_col], observed=True, dropna=False)[count_col]
+        .count()
+        .unstack(fill_value=0)
     )
 
-    pivot_df = pivot_df.reindex(columns=category_order, fill_value=0)
-    pivot_df.loc['Grand Total'] = pivot_df.sum()
+    counts = counts.reindex(columns=category_order, fill_value=0)
+    # Categorical labels can't take new entries; use plain ones for reset_index
+    counts.columns = counts.columns.astype(object)
+    category_totals = counts.sum()
+
+    pivot_df = counts[counts.index.notna()].copy()
+    pivot_df.loc['Grand Total'] = pivot_df.to_numpy().sum(axis=0)
     pivot_df.reset_index(inplace=True)
 
     _write_pivot_sheet(ws, pivot_df)
     _add_performance_chart(ws, pivot_df, category_order)
 
+    return category_totals
+
 
 def _get_count_column(df):
     """
     Determine which column to use for counting rows in the pivot.
     """
-    preferred_columns = ['Email', 'email', 'Name', 'name']
-    for col in preferred_columns:
-        if col in df.columns:
-            return col
-        for df_col in df.columns:
-            if str(df_col).lower() == col.lower():
-                return df_col
+    columns = _col_index(df)
+    for col_lower in ('email', 'name'):
+        if col_lower in columns:
+            return columns[col_lower]
     return df.columns[0]
 
 
@@ -366,41 +429,31 @@ def _write_pivot_sheet(ws, pivot_df):
     """
     Write pivot data into the worksheet with formatting.
     """
-    header_fill = PatternFill(start_color="1E4E79", end_color="1E4E79", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    center_alignment = Alignment(horizontal="center", vertical="center")
-    thin_side = Side(style='thin', color="000000")
-    thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
+    set_column_widths(ws, pivot_df, 60)
 
-    for col_idx, col_name in enumerate(pivot_df.columns, start=1):
-        cell = ws.cell(row=1, column=col_idx, value=str(col_name))
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = thin_border
+    header_cells = []
+    for col_name in pivot_df.columns:
+        cell = WriteOnlyCell(ws, value=str(col_name))
+        cell.fill = _HEADER_FILL
+        cell.font = _HEADER_FONT
+        cell.alignment = _CENTER_ALIGN
+        cell.border = _THIN_BORDER
+        header_cells.append(cell)
+    ws.append(header_cells)
 
     total_row_idx = len(pivot_df) + 1
-    for row_idx, row_data in enumerate(pivot_df.values, start=2):
+    for row_idx, row_data in enumerate(pivot_df.itertuples(index=False, name=None), start=2):
         is_total_row = (row_idx == total_row_idx)
-        for col_idx, value in enumerate(row_data, start=1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=value)
-            cell.alignment = center_alignment
-            cell.border = thin_border
+        row_cells = []
+        for value in row_data:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.alignment = _CENTER_ALIGN
+            cell.border = _THIN_BORDER
             if is_total_row:
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-
-    for column_cells in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column_cells[0].column)
-        for cell in column_cells:
-            try:
-                cell_length = len(str(cell.value)) if cell.value is not None else 0
-                if cell_length > max_length:
-                    max_length = cell_length
-            except Exception:
-                continue
-        ws.column_dimensions[column_letter].width = min(max_length + 2, 60)
+                cell.font = _TOTAL_FONT
+                cell.fill = _TOTAL_FILL
+            row_cells.append(cell)
+        ws.append(row_cells)
 
 
 def _add_performance_chart(ws, pivot_df, category_order):
@@ -430,18 +483,16 @@ def _add_performance_chart(ws, pivot_df, category_order):
     ws.add_chart(chart, f"A{num_rows + 4}")
 
 
-def _add_overall_performance_summary(wb, df):
+def _add_overall_performance_summary(wb, category_totals):
     """
     Create the Overall Performance Summary sheet with summary table and chart.
+
+    category_totals are the per-category counts returned by
+    _add_div_wise_performance_summary, so the data isn't grouped again.
     """
     sheet_name = 'Overall Performance Summary'
-    if sheet_name in wb.sheetnames:
-        del wb[sheet_name]
     ws = wb.create_sheet(sheet_name)
 
-    category_col = _match_exact_column(df, 'Category')
-    count_col = _get_count_column(df)
-
     category_order = [
         'Good (75%+)',
         'Satisfactory (50% - 75%)',
@@ -450,8 +501,7 @@ def _add_overall_performance_summary(wb, df):
         'Not Started',
     ]
 
-    summary_series = df.groupby(category_col)[count_col].count()
-    summary_df = summary_series.reindex(category_order, fill_value=0).reset_index()
+    summary_df = category_totals.reindex(category_order, fill_value=0).reset_index()
     summary_df.columns = ['Category', 'Count']
     grand_total = summary_df['Count'].sum()
     grand_row = pd.DataFrame([{'Category': 'Grand Total', 'Count': grand_total}])
@@ -465,42 +515,31 @@ def _write_overall_summary_table(ws, summary_df):
     """
     Write the overall summary table with formatting.
     """
-    header_fill = PatternFill(start_color="1E4E79", end_color="1E4E79", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    center_alignment = Alignment(horizontal="center", vertical="center")
-    thin_side = Side(style='thin', color="000000")
-    thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
+    set_column_widths(ws, summary_df, 60)
 
-    headers = list(summary_df.columns)
-    for col_idx, col_name in enumerate(headers, start=1):
-        cell = ws.cell(row=1, column=col_idx, value=col_name)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = thin_border
+    header_cells = []
+    for col_name in summary_df.columns:
+        cell = WriteOnlyCell(ws, value=col_name)
+        cell.fill = _HEADER_FILL
+        cell.font = _HEADER_FONT
+        cell.alignment = _CENTER_ALIGN
+        cell.border = _THIN_BORDER
+        header_cells.append(cell)
+    ws.append(header_cells)
 
     total_rows = len(summary_df) + 1  # includes header row
     for row_idx, row in enumerate(summary_df.itertuples(index=False, name=None), start=2):
         is_total_row = (row[0] == 'Grand Total')
-        for col_idx, value in enumerate(row, start=1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=value)
-            cell.alignment = center_alignment
-            cell.border = thin_border
+        row_cells = []
+        for value in row:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.alignment = _CENTER_ALIGN
+            cell.border = _THIN_BORDER
             if is_total_row:
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-
-    # Auto column widths
-    for column_cells in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column_cells[0].column)
-        for cell in column_cells:
-            try:
-                length = len(str(cell.value)) if cell.value is not None else 0
-                max_length = max(max_length, length)
-            except Exception:
-                continue
-        ws.column_dimensions[column_letter].width = min(max_length + 2, 60)
+                cell.font = _TOTAL_FONT
+                cell.fill = _TOTAL_FILL
+            row_cells.append(cell)
+        ws.append(row_cells)
 
     return total_rows
 
@@ -535,11 +574,10 @@ def _add_attempt_status_summary(wb, df):
     Create the Attempt Status Summary sheet with table and chart.
     """
     sheet_name = 'Attempt Status Summary'
-    if sheet_name in wb.sheetnames:
-        del wb[sheet_name]
     ws = wb.create_sheet(sheet_name)
 
-    status_col = _get_column(df, ['attempt', 'status'])
+    columns = _col_index(df)
+    status_col = _get_column(columns, ['attempt', 'status'])
     count_col = _get_count_column(df)
 
     status_order = [
@@ -548,7 +586,8 @@ def _add_attempt_status_summary(wb, df):
         'No Attempt',
     ]
 
-    summary_series = df.groupby(status_col)[count_col].count()
+    # Only rows with a value in the count column are counted
+    summary_series = df.loc[df[count_col].notna(), status_col].value_counts()
     summary_df = summary_series.reindex(status_order, fill_value=0).reset_index()
     summary_df.columns = ['Attempt Status', 'Count of Email']
     grand_total = summary_df['Count of Email'].sum()
@@ -563,40 +602,30 @@ def _write_attempt_status_table(ws, summary_df):
     """
     Write Attempt Status summary table with formatting.
     """
-    header_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-    header_font = Font(color="000000", bold=True)
-    center_alignment = Alignment(horizontal="center", vertical="center")
-    thin_side = Side(style='thin', color="000000")
-    thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
+    set_column_widths(ws, summary_df, 40)
 
-    headers = list(summary_df.columns)
-    for col_idx, col_name in enumerate(headers, start=1):
-        cell = ws.cell(row=1, column=col_idx, value=col_name)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = thin_border
+    header_cells = []
+    for col_name in summary_df.columns:
+        cell = WriteOnlyCell(ws, value=col_name)
+        cell.fill = _LIGHT_HEADER_FILL
+        cell.font = _LIGHT_HEADER_FONT
+        cell.alignment = _CENTER_ALIGN
+        cell.border = _THIN_BORDER
+        header_cells.append(cell)
+    ws.append(header_cells)
 
     for row_idx, row in enumerate(summary_df.itertuples(index=False, name=None), start=2):
         is_total_row = (row[0] == 'Grand Total')
-        for col_idx, value in enumerate(row, start=1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=value)
-            cell.alignment = center_alignment
-            cell.border = thin_border
+        row_cells = []
+        for value in row:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.alignment = _CENTER_ALIGN
+            cell.border = _THIN_BORDER
             if is_total_row:
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="E9EDF5", end_color="E9EDF5", fill_type="solid")
-
-    for column_cells in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column_cells[0].column)
-        for cell in column_cells:
-            try:
-                length = len(str(cell.value)) if cell.value is not None else 0
-                max_length = max(max_length, length)
-            except Exception:
-                continue
-        ws.column_dimensions[column_letter].width = min(max_length + 2, 40)
+                cell.font = _TOTAL_FONT
+                cell.fill = _LIGHT_TOTAL_FILL
+            row_cells.append(cell)
+        ws.append(row_cells)
 
     return len(summary_df) + 1
 
@@ -631,73 +660,77 @@ def _add_attempt_status_chart(ws, total_rows):
 def _add_div_wise_participation_summary(wb, df):
     """
     Create the Div Wise Participation Summary sheet with table and chart.
+
+    Returns the count per test status over all rows, including rows without
+    a department, for the Overall Participation Summary.
     """
     sheet_name = 'Div Wise Participation Summary'
-    if sheet_name in wb.sheetnames:
-        del wb[sheet_name]
     ws = wb.create_sheet(sheet_name)
 
-    dept_col = _get_column(df, ['department'])
-    status_col = _get_column(df, ['test', 'status'])
+    columns = _col_index(df)
+    dept_col = _get_column(columns, ['department'])
+    status_col = _get_column(columns, ['test', 'status'])
     count_col = _get_count_column(df)
 
     status_order = ['Completed', 'Not Started']
 
-    pivot_df = pd.pivot_table(
-        df,
-        index=dept_col,
-        columns=status_col,
-        values=count_col,
-        aggfunc='count',
-        fill_value=0
+    # Direct groupby count; rows with an empty count column are not counted.
+    # Rows without a department are kept here for the overall totals, but
+    # rows without a test status are dropped first, as pivot_table did, so a
+    # department with only blank statuses doesn't get an all-zero row.
+    counts = (
+        df[df[status_col].notna()]
+        .groupby([dept_col, status_col], dropna=False)[count_col]
+        .count()
+        .unstack(fill_value=0)
     )
-    pivot_df = pivot_df.reindex(columns=status_order, fill_value=0)
-    pivot_df['Grand Total'] = pivot_df.sum(axis=1)
-    pivot_df.loc['Grand Total'] = pivot_df.sum()
+    counts = counts.reindex(columns=status_order, fill_value=0)
+    status_totals = counts.sum()
+
+    pivot_df = counts[counts.index.notna()].copy()
+
+    # Row and column totals from a single count matrix
+    count_matrix = pivot_df.to_numpy()
+    row_totals = count_matrix.sum(axis=1)
+    pivot_df['Grand Total'] = row_totals
+    pivot_df.loc['Grand Total'] = np.append(count_matrix.sum(axis=0), row_totals.sum())
     pivot_df.reset_index(inplace=True)
 
     _write_participation_table(ws, pivot_df)
     _add_participation_chart(ws, len(pivot_df), len(status_order))
 
+    return status_totals
+
 
 def _write_participation_table(ws, pivot_df):
     """
     Write participation summary table with formatting.
     """
-    header_fill = PatternFill(start_color="1E4E79", end_color="1E4E79", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    center_alignment = Alignment(horizontal="center", vertical="center")
-    thin_side = Side(style='thin', color="000000")
-    thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
+    set_column_widths(ws, pivot_df, 60)
 
-    for col_idx, col_name in enumerate(pivot_df.columns, start=1):
-        cell = ws.cell(row=1, column=col_idx, value=str(col_name))
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = thin_border
+    header_cells = []
+    for col_name in pivot_df.columns:
+        cell = WriteOnlyCell(ws, value=str(col_name))
+        cell.fill = _HEADER_FILL
+        cell.font = _HEADER_FONT
+        cell.alignment = _CENTER_ALIGN
+        cell.border = _THIN_BORDER
+        header_cells.append(cell)
+    ws.append(header_cells)
 
     total_row_idx = len(pivot_df) + 1
     for row_idx, row in enumerate(pivot_df.itertuples(index=False, name=None), start=2):
         is_total_row = (row[0] == 'Grand Total')
-        for col_idx, value in enumerate(row, start=1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=value)
-            cell.alignment = center_alignment
-            cell.border = thin_border
+        row_cells = []
+        for value in row:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.alignment = _CENTER_ALIGN
+            cell.border = _THIN_BORDER
             if is_total_row:
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-
-    for column_cells in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column_cells[0].column)
-        for cell in column_cells:
-            try:
-                length = len(str(cell.value)) if cell.value is not None else 0
-                max_length = max(max_length, length)
-            except Exception:
-                continue
-        ws.column_dimensions[column_letter].width = min(max_length + 2, 60)
+                cell.font = _TOTAL_FONT
+                cell.fill = _TOTAL_FILL
+            row_cells.append(cell)
+        ws.append(row_cells)
 
 
 def _add_participation_chart(ws, total_rows, status_count):
@@ -730,21 +763,18 @@ def _add_participation_chart(ws, total_rows, status_count):
     ws.add_chart(chart, f"A{total_rows + 2}")
 
 
-def _add_overall_participation_summary(wb, df):
+def _add_overall_participation_summary(wb, status_totals):
     """
     Create the Overall Participation Summary sheet with table and chart.
+
+    status_totals are the per-status counts returned by
+    _add_div_wise_participation_summary, so the data isn't grouped again.
     """
     sheet_name = 'Overall Participation Summary'
-    if sheet_name in wb.sheetnames:
-        del wb[sheet_name]
     ws = wb.create_sheet(sheet_name)
 
-    status_col = _get_column(df, ['test', 'status'])
-    count_col = _get_count_column(df)
-
     status_order = ['Completed', 'Not Started']
-    summary_series = df.groupby(status_col)[count_col].count()
-    summary_df = summary_series.reindex(status_order, fill_value=0).reset_index()
+    summary_df = status_totals.reindex(status_order, fill_value=0).reset_index()
     summary_df.columns = ['Test Status', 'Count']
 
     grand_total = summary_df['Count'].sum()
@@ -759,40 +789,30 @@ def _write_overall_participation_table(ws, summary_df):
     """
     Write the overall participation table with formatting.
     """
-    header_fill = PatternFill(start_color="1E4E79", end_color="1E4E79", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    center_alignment = Alignment(horizontal="center", vertical="center")
-    thin_side = Side(style='thin', color="000000")
-    thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
+    set_column_widths(ws, summary_df, 40)
 
-    headers = list(summary_df.columns)
-    for col_idx, col_name in enumerate(headers, start=1):
-        cell = ws.cell(row=1, column=col_idx, value=col_name)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = thin_border
+    header_cells = []
+    for col_name in summary_df.columns:
+        cell = WriteOnlyCell(ws, value=col_name)
+        cell.fill = _HEADER_FILL
+        cell.font = _HEADER_FONT
+        cell.alignment = _CENTER_ALIGN
+        cell.border = _THIN_BORDER
+        header_cells.append(cell)
+    ws.append(header_cells)
 
     for row_idx, row in enumerate(summary_df.itertuples(index=False, name=None), start=2):
         is_total_row = (row[0] == 'Grand Total')
-        for col_idx, value in enumerate(row, start=1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=value)
-            cell.alignment = center_alignment
-            cell.border = thin_border
+        row_cells = []
+        for value in row:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.alignment = _CENTER_ALIGN
+            cell.border = _THIN_BORDER
             if is_total_row:
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-
-    for column_cells in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column_cells[0].column)
-        for cell in column_cells:
-            try:
-                length = len(str(cell.value)) if cell.value is not None else 0
-                max_length = max(max_length, length)
-            except Exception:
-                continue
-        ws.column_dimensions[column_letter].width = min(max_length + 2, 40)
+                cell.font = _TOTAL_FONT
+                cell.fill = _TOTAL_FILL
+            row_cells.append(cell)
+        ws.append(row_cells)
 
     return len(summary_df) + 1  # include header row
 
@@ -5,85 +5,25 @@ This module generates a performance report from an Excel file.
 It categorizes performance scores and creates pivot tables and charts.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.chart import BarChart, Reference
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
-from reports.participation import generate_participation_report
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from reports._styles import set_column_widths, COL_LETTERS, HEADER_FILL, HEADER_FONT, HEADER_ALIGN, THIN_BORDER, ALT_ROW_FILL, GT_FILL, GT_FONT
+from reports.participation import (
+    add_participation_summary,
+    create_participation_pivot,
+    load_input_file,
+)
 
 
-def read_csv_with_encoding(file_path):
-    """
-    Read CSV file with automatic encoding detection and robust parsing.
-    Tries multiple encodings and delimiters to handle various CSV formats.
-    
-    Args:
-        file_path (str): Path to the CSV file
-    
-    Returns:
-        pandas.DataFrame: DataFrame with CSV data
-    
-    Raises:
-        ValueError: If file cannot be read with any method
-    """
-    encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'windows-1252']
-    delimiters = [',', ';', '\t', '|']
-    
-    # Try different combinations of encoding and delimiter
-    for encoding in encodings:
-        for delimiter in delimiters:
-            try:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=encoding,
-                    delimiter=delimiter,
-                    quotechar='"',
-                    on_bad_lines='skip',  # Skip malformed lines
-                    engine='python',  # Use Python engine for better error handling
-                    skipinitialspace=True
-                )
-                # If we got here and have data, return it
-                if len(df) > 0:
-                    return df
-            except (UnicodeDecodeError, UnicodeError):
-                continue
-            except Exception as e:
-                # If it's not an encoding error, try next delimiter
-                if 'codec' in str(e).lower() or 'decode' in str(e).lower():
-                    continue
-                # For other errors, try next delimiter
-                continue
-    
-    # If all combinations failed, try with most lenient settings (auto-detect separator)
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(
-                file_path,
-                encoding=encoding,
-                on_bad_lines='skip',
-                engine='python',
-                sep=None,  # Auto-detect separator
-                skipinitialspace=True
-            )
-            if len(df) > 0:
-                return df
-        except Exception:
-            continue
-    
-    # Last resort: try with errors='replace'
-    try:
-        return pd.read_csv(
-            file_path,
-            encoding='utf-8',
-            errors='replace',
-            on_bad_lines='skip',
-            engine='python',
-            sep=None,
-            skipinitialspace=True
-        )
-    except Exception as e:
-        raise ValueError(f"Unable to read CSV file. Error: {str(e)}")
+# Performance categories, in the order they appear in the summary
+_CATEGORY_ORDER = ['Good', 'Satisfactory', 'Need Attention', 'Intervention', 'Not Attended']
+
+# Substrings of the column names create_participation_pivot looks for
+_PARTICIPATION_KEYWORDS = ('department', 'status', 'name')
 
 
 def generate_performance_report(input_file, output_file):
@@ -91,147 +31,117 @@ def generate_performance_report(input_file, output_file):
     Generate a performance report with categorization and pivot tables.
     
     Args:
-        input_file (str): Path to the input Excel file
-        output_file (str): Path to save the output Excel file
+        input_file (str or pandas.DataFrame): Path to the input file (CSV, XLSX,
+            or XLS), or a DataFrame already loaded from it
+        output_file (str or file-like): Path or binary stream to save the
+            output Excel file to
     
     Returns:
-        str: Path to the generated output file
+        str or file-like: The output_file argument
     """
-    # First generate participation report
-    temp_output = output_file.replace('.xlsx', '_temp.xlsx')
-    generate_participation_report(input_file, temp_output)
-    
-    # Load the workbook
-    wb = load_workbook(temp_output)
-    
-    # Detect file extension and read original data accordingly
-    file_ext = input_file.lower().split('.')[-1]
-    
-    if file_ext == "csv":
-        df = read_csv_with_encoding(input_file)
-    elif file_ext in ["xlsx", "xls"]:
-        try:
-            df = pd.read_excel(input_file)
-        except Exception as e:
-            error_msg = str(e).lower()
-            # Check if it's a corrupted/invalid Excel file - try CSV as fallback
-            if 'cannot be used in worksheets' in error_msg or 'badzipfile' in error_msg or 'corrupt' in error_msg:
-                # Try reading as CSV instead (file might be misnamed)
-                try:
-                    df = read_csv_with_encoding(input_file)
-                    # Successfully read as CSV, continue processing
-                except:
-                    raise ValueError(f"Invalid or corrupted file. The file '{input_file}' cannot be read as Excel or CSV. Please ensure the file is valid.")
-            else:
-                raise ValueError(f"Error reading Excel file: {str(e)}. Please ensure the file is valid.")
+    if isinstance(input_file, pd.DataFrame):
+        # Caller already parsed the file, don't read it again
+        df = input_file
     else:
-        raise ValueError("Unsupported file format. Please upload CSV or Excel files.")
-    
-    # Find Test Status column and percentage column
-    status_col = None
-    percentage_col = None
-    status_idx = None
-    percentage_idx = None
-    
-    # Find Test Status column
-    for idx, col in enumerate(df.columns):
-        col_lower = str(col).lower()
-        if 'test status' in col_lower or ('status' in col_lower and 'test' in col_lower):
-            status_col = col
-            status_idx = idx
-            break
-    
-    if status_col is None:
+        df = load_input_file(input_file)
+    
+    # Lowercase column names once for all the column searches below
+    cols = list(df.columns)
+    cols_lower = [str(col).lower() for col in cols]
+    
+    # The participation summary is built from the data as uploaded and does
+    # not depend on the categories, so build it on a worker thread while this
+    # one categorizes scores (pandas releases the GIL in most of that work).
+    # The worker gets its own deep copy of just the columns it can use, so
+    # nothing done to df below can affect it. Each call has its own executor,
+    # so concurrent reports don't queue behind each other.
+    source_df = df
+    participation_df = _participation_columns(df, cols_lower).copy()
+    executor = ThreadPoolExecutor(max_workers=1)
+    participation_future = executor.submit(create_participation_pivot, participation_df)
+    # No more work for this executor; its thread exits once the pivot is built
+    executor.shutdown(wait=False)
+    
+    # Find Test Status column (any column mentioning both "test" and "status")
+    status_idx = _find_col(cols_lower, 'test', 'status')
+    if status_idx is None:
         raise ValueError("Required column 'Test Status' not found in the Excel file")
     
     # Find the FIRST column after Test Status that contains EXACTLY "total percentage"
-    for idx in range(status_idx + 1, len(df.columns)):
-        col = df.columns[idx]
-        col_lower = str(col).lower()
-        # Check for EXACT phrase "total percentage" (case insensitive)
-        if 'total percentage' in col_lower:
-            percentage_col = col
-            percentage_idx = idx
-            break
-    
-    if percentage_col is None:
+    percentage_idx = _find_col(cols_lower, 'total percentage', start=status_idx + 1)
+    if percentage_idx is None:
         raise ValueError("Column containing 'total percentage' not found after 'Test Status' column")
+    percentage_col = cols[percentage_idx]
     
     # Calculate Category column
-    category_series = df[percentage_col].apply(_categorize_performance)
-    
-    # Insert Category column right after the percentage column
-    # Get all columns up to and including percentage column
-    cols_before = list(df.columns[:percentage_idx + 1])
-    cols_after = list(df.columns[percentage_idx + 1:])
-    
-    # Create new column order with Category inserted
-    new_columns = cols_before + ['Category'] + cols_after
-    df = df.reindex(columns=new_columns)
-    df['Category'] = category_series
-    
-    # Create performance pivot table
-    dept_col = None
-    for col in df.columns:
-        if 'department' in str(col).lower():
-            dept_col = col
-            break
-    
-    if dept_col is None:
+    category_series = _categorize_performance(df[percentage_col])
+    
+    # Insert Category column right after the percentage column. The shallow
+    # copy keeps the caller's DataFrame unchanged without copying the data.
+    df = df.copy(deep=False)
+    df.insert(percentage_idx + 1, 'Category', category_series.values)
+    
+    # Create performance pivot table. Category is inserted after the
+    # percentage column, so indexes found in cols still refer to the same
+    # columns when looked up by name.
+    dept_idx = _find_col(cols_lower, 'department')
+    if dept_idx is None:
         raise ValueError("Required column 'Department' not found in the Excel file")
+    dept_col = cols[dept_idx]
     
     # Find Name column for counting (or use first column)
-    name_col = None
-    for col in df.columns:
-        if 'name' in str(col).lower():
-            name_col = col
-            break
-    
-    if name_col is None:
-        # Use first column as fallback
-        name_col = df.columns[0]
-    
-    # Create pivot table with Grand Total row and column
-    pivot_df = pd.pivot_table(
-        df,
-        index=dept_col,
-        columns='Category',
-        values=name_col,
-        aggfunc='count',
-        fill_value=0,
-        margins=True,
-        margins_name="Grand Total"
+    name_idx = _find_col(cols_lower, 'name')
+    name_col = cols[name_idx] if name_idx is not None else cols[0]
+    
+    # Group on categorical keys so rows are grouped by integer codes instead
+    # of hashing every string. With observed=False every category gets a
+    # column, in _CATEGORY_ORDER, even if no row falls into it. The Data sheet
+    # keeps plain string columns.
+    dept_keys = df[dept_col].astype('category')
+    category_keys = pd.Series(
+        pd.Categorical(category_series.values, categories=_CATEGORY_ORDER),
+        index=df.index,
+        name='Category'
     )
     
+    # Count names per department and category in a single groupby
+    pivot_df = (
+        df.groupby([dept_keys, category_keys], observed=False)[name_col]
+        .count()
+        .unstack(fill_value=0)
+    )
+    
+    # Categorical labels can't take new entries; use plain ones for the totals
+    pivot_df.index = pivot_df.index.astype(object)
+    pivot_df.columns = pivot_df.columns.astype(object)
+    
+    # Add Grand Total column and row
+    pivot_df['Grand Total'] = pivot_df.sum(axis=1)
+    pivot_df.loc['Grand Total'] = pivot_df.sum(axis=0)
+    
     # Reset index to make Department a column
     pivot_df = pivot_df.reset_index()
     
     # Remove any unnamed columns (blank columns that might appear)
-    pivot_df = pivot_df.loc[:, ~pivot_df.columns.str.contains('^Unnamed', na=False)]
-    
-    # Get the department column name (first column after reset_index)
-    dept_col_name = pivot_df.columns[0]
-    
-    # Get all other columns (category columns + Grand Total)
-    other_cols = [col for col in pivot_df.columns if col != dept_col_name]
-    
-    # Reorder columns: Department first, then category columns, then Grand Total
-    # Sort other columns to put Grand Total at the end
-    category_cols = [col for col in other_cols if col != 'Grand Total']
-    # Define preferred order for categories
-    category_order = ['Good', 'Satisfactory', 'Need Attention', 'Intervention', 'Not Attended']
-    category_cols_sorted = sorted(category_cols, key=lambda x: (
-        category_order.index(x) if x in category_order else 999
-    ))
-    
-    # Final column order: Department, Category columns, Grand Total
-    if 'Grand Total' in other_cols:
-        final_cols = [dept_col_name] + category_cols_sorted + ['Grand Total']
-    else:
-        final_cols = [dept_col_name] + category_cols_sorted
+    keep = [not (isinstance(col, str) and col.startswith('Unnamed')) for col in pivot_df.columns]
+    pivot_df = pivot_df.loc[:, keep]
+    
+    # Columns are already Department, categories in _CATEGORY_ORDER, Grand Total
     
-    # Reorder columns
-    pivot_df = pivot_df[final_cols]
+    # Store the counts in the narrowest integer dtype. The Data sheet is
+    # written as it was uploaded; itertuples yields Python ints either way.
+    pivot_df = _downcast_integers(pivot_df)
+    
+    # Build the final workbook in one pass. Write-only sheets stream rows to
+    # the file as they are appended instead of keeping every cell in memory.
+    wb = Workbook(write_only=True)
+    
+    # Data sheet with the Category column in its position
+    ws_data = wb.create_sheet("Data")
+    _write_data_sheet_with_category(ws_data, df)
+    
+    # Participation Summary sheet, same as the participation report
+    add_participation_summary(wb, source_df, participation_future.result())
     
     # Create Performance Summary sheet
     ws_performance = wb.create_sheet("Performance Summary")
@@ -240,24 +150,84 @@ def generate_performance_report(input_file, output_file):
     # Add bar chart
     _add_performance_chart(ws_performance, pivot_df)
     
-    # Update Data sheet with Category column inserted in correct position
-    ws_data = wb["Data"]
-    _rewrite_data_sheet_with_category(ws_data, df)
-    
     # Save final workbook
     wb.save(output_file)
     
-    # Clean up temp file
-    import os
-    if os.path.exists(temp_output):
-        os.remove(temp_output)
-    
     return output_file
 
 
-def _categorize_performance(value):
+def _participation_columns(df, cols_lower):
     """
-    Categorize performance based on percentage value.
+    Select the columns create_participation_pivot can pick from: the first
+    column (its fallback name column) and every column whose name mentions
+    department, status or name. Column order is kept, so the pivot picks
+    the same columns as it would from the full frame.
+    
+    Args:
+        df: pandas DataFrame
+        cols_lower (list): Lowercase column names of df
+    
+    Returns:
+        pandas DataFrame: The selected columns (not a copy)
+    """
+    positions = [
+        idx for idx, col_lower in enumerate(cols_lower)
+        if idx == 0 or any(keyword in col_lower for keyword in _PARTICIPATION_KEYWORDS)
+    ]
+    return df.iloc[:, positions]
+
+
+def _find_col(cols_lower, *keywords, start=0):
+    """
+    Find the first column whose lowercase name contains all keywords.
+    
+    Args:
+        cols_lower (list): Lowercase column names
+        *keywords (str): Lowercase substrings that must all appear in the name
+        start (int): Index to start searching from
+    
+    Returns:
+        int or None: Index of the matching column, or None if none matches
+    """
+    return next(
+        (idx for idx in range(start, len(cols_lower))
+         if all(keyword in cols_lower[idx] for keyword in keywords)),
+        None
+    )
+
+
+def _downcast_integers(df):
+    """
+    Downcast integer columns to the smallest integer dtype that holds them.
+    Float columns are left alone: float32 would change the values written.
+    
+    Args:
+        df: pandas DataFrame
+    
+    Returns:
+        pandas DataFrame: Shallow copy with downcast integer columns, or df
+            itself if it has none
+    """
+    # np.timedelta64 subclasses np.integer, so select_dtypes(np.integer) would
+    # also pick up durations and turn them into integer nanoseconds
+    int_cols = [
+        col for col in df.columns
+        if pd.api.types.is_integer_dtype(df[col]) and not pd.api.types.is_timedelta64_dtype(df[col])
+    ]
+    if not int_cols:
+        return df
+    
+    df = df.copy(deep=False)
+    for col in int_cols:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def _categorize_performance(values):
+    """
+    Categorize performance based on percentage values.
+    Percentages repeat a lot (e.g. whole-number scores), so only the
+    distinct values are classified and the result is mapped back by code.
     
     Rules:
     > 75 → Good
@@ -267,41 +237,56 @@ def _categorize_performance(value):
     NA / empty / "-" / "NA" / "n/a" / missing → Not Attended
     
     Args:
-        value: Percentage value (numeric or string, may contain %)
+        values (pandas.Series): Percentage values (numeric or string, may contain %)
     
     Returns:
-        str: Category name
+        pandas.Series: Category name for each value
     """
-    # Handle NaN, None, or empty values
-    if pd.isna(value):
-        return "Not Attended"
+    # Missing values get code -1
+    codes, uniques = pd.factorize(values)
+    unique_categories = _categorize_values(pd.Series(uniques))
+    
+    # Code -1 picks the appended "Not Attended" entry
+    lookup = np.append(unique_categories, "Not Attended")
+    return pd.Series(lookup[codes], index=values.index)
+
+
+def _categorize_values(values):
+    """
+    Apply the category rules to a Series of percentage values with
+    vectorized string and NumPy operations.
+    
+    Args:
+        values (pandas.Series): Percentage values
     
+    Returns:
+        numpy.ndarray: Category name for each value
+    """
     # Convert to string and strip whitespace
-    value_str = str(value).strip()
+    value_str = values.astype(str).str.strip()
     
-    # Handle empty strings and special values
-    if value_str == '' or value_str.upper() in ['NA', 'N/A', '-', 'NULL', 'NONE']:
-        return "Not Attended"
+    # Handle NaN/None, empty strings and special values
+    not_attended = (
+        values.isna()
+        | (value_str == '')
+        | value_str.str.upper().isin(['NA', 'N/A', '-', 'NULL', 'NONE'])
+    )
     
-    try:
-        # Remove % symbol if present
-        value_str = value_str.replace('%', '').strip()
-        
-        # Convert to float
-        num_value = float(value_str)
-        
-        # Apply category rules
-        if num_value > 75:
-            return "Good"
-        elif num_value > 50:
-            return "Satisfactory"
-        elif num_value > 25:
-            return "Need Attention"
-        else:
-            return "Intervention"
-    except (ValueError, TypeError):
-        # If conversion fails, treat as Not Attended
-        return "Not Attended"
+    # Remove % symbol if present and convert to numbers; values that can't be
+    # converted are treated as Not Attended
+    num_value = pd.to_numeric(
+        value_str.str.replace('%', '', regex=False).str.strip(),
+        errors='coerce'
+    )
+    not_attended |= num_value.isna()
+    
+    # Apply category rules
+    categories = np.select(
+        [not_attended, num_value > 75, num_value > 50, num_value > 25],
+        ["Not Attended", "Good", "Satisfactory", "Need Attention"],
+        default="Intervention"
+    )
+    return categories
 
 
 def _write_pivot_to_sheet(ws, pivot_df, title):
@@ -309,55 +294,45 @@ def _write_pivot_to_sheet(ws, pivot_df, title):
     Write pivot table data to worksheet with styling.
     
     Args:
-        ws: openpyxl worksheet object
+        ws: openpyxl write-only worksheet object
         pivot_df: pandas DataFrame (pivot table)
         title: Sheet title
     """
-    # Write headers
-    header_fill = PatternFill(start_color="002060", end_color="002060", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    for col_idx, col_name in enumerate(pivot_df.columns, start=1):
-        cell = ws.cell(row=1, column=col_idx)
-        cell.value = str(col_name)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.border = thin_border
+    # Auto-adjust column widths (must be set before any row is written)
+    set_column_widths(ws, pivot_df)
     
-    # Write data
-    for row_idx, row_data in enumerate(pivot_df.values, start=2):
+    # Write headers
+    header_cells = []
+    for col_name in pivot_df.columns:
+        cell = WriteOnlyCell(ws, value=str(col_name))
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGN
+        cell.border = THIN_BORDER
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    # Write data; itertuples yields native Python values without an object
+    # array of the whole table
+    for row_idx, row_data in enumerate(pivot_df.itertuples(index=False, name=None), start=2):
         # Check if this is the Grand Total row (last row)
         is_grand_total_row = (row_idx == len(pivot_df) + 1)
         
-        for col_idx, value in enumerate(row_data, start=1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.value = value
-            cell.border = thin_border
+        row_cells = []
+        for value in row_data:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.border = THIN_BORDER
             
             if is_grand_total_row:
                 # Style Grand Total row with bold font and different background
-                cell.font = Font(bold=True, size=11)
-                cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+                cell.font = GT_FONT
+                cell.fill = GT_FILL
             else:
                 # Alternate row coloring for regular rows
                 if row_idx % 2 == 0:
-                    cell.fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-    
-    # Auto-adjust column widths
-    for col_idx, col_name in enumerate(pivot_df.columns, start=1):
-        max_length = max(
-            len(str(col_name)),
-            pivot_df[col_name].astype(str).map(len).max() if len(pivot_df) > 0 else 0
-        )
-        ws.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 2, 50)
+                    cell.fill = ALT_ROW_FILL
+            row_cells.append(cell)
+        ws.append(row_cells)
 
 
 def _add_performance_chart(ws, pivot_df):
@@ -370,6 +345,8 @@ def _add_performance_chart(ws, pivot_df):
         ws: openpyxl worksheet object
         pivot_df: pandas DataFrame (pivot table with Grand Total row)
     """
+    # Chart modules are only needed here, so they're imported on first use
+    from openpyxl.chart import BarChart, Reference
     from openpyxl.chart.label import DataLabelList
     from openpyxl.chart.text import RichText
     
@@ -397,6 +374,9 @@ def _add_performance_chart(ws, pivot_df):
     chart.add_data(data, titles_from_data=True)
     chart.set_categories(cats)
     
+    # One color per series rather than per point; each series is a category
+    chart.varyColors = False
+    
     # Hide category labels on the axis so only counts show on the bars
     chart.x_axis.tickLblPos = "none"
     chart.x_axis.tickLblSkip = 1  # Kept for compatibility; has no effect when labels are hidden
@@ -421,98 +401,38 @@ def _add_performance_chart(ws, pivot_df):
     ws.add_chart(chart, f"A{num_rows + 3}")
 
 
-def _add_category_to_data_sheet(ws, df):
-    """
-    Add Category column to the Data sheet in the correct position.
-    
-    Args:
-        ws: openpyxl worksheet object
-        df: pandas DataFrame with Category column (already inserted in correct position)
-    """
-    # Find the Category column index in the DataFrame
-    category_idx = list(df.columns).index('Category')
-    category_col_num = category_idx + 1  # Excel columns are 1-indexed
-    
-    # Write Category header
-    header_fill = PatternFill(start_color="002060", end_color="002060", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    category_cell = ws.cell(row=1, column=category_col_num)
-    category_cell.value = "Category"
-    category_cell.fill = header_fill
-    category_cell.font = header_font
-    category_cell.alignment = header_alignment
-    category_cell.border = thin_border
-    
-    # Write Category data
-    for row_idx, category in enumerate(df['Category'], start=2):
-        cell = ws.cell(row=row_idx, column=category_col_num)
-        cell.value = category
-        cell.border = thin_border
-        if row_idx % 2 == 0:
-            cell.fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-    
-    # Auto-adjust column width
-    max_length = max(
-        len("Category"),
-        df['Category'].astype(str).map(len).max() if len(df) > 0 else 0
-    )
-    ws.column_dimensions[get_column_letter(category_col_num)].width = min(max_length + 2, 50)
-
-
-def _rewrite_data_sheet_with_category(ws, df):
+def _write_data_sheet_with_category(ws, df):
     """
-    Rewrite the entire Data sheet with Category column in the correct position.
+    Write the entire Data sheet with Category column in the correct position.
     
     Args:
-        ws: openpyxl worksheet object
+        ws: openpyxl write-only worksheet object
         df: pandas DataFrame with Category column already inserted in correct position
     """
-    # Clear existing data (keep the sheet structure)
-    ws.delete_rows(1, ws.max_row)
-    
-    # Header styling
-    header_fill = PatternFill(start_color="002060", end_color="002060", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    # Auto-adjust column widths (must be set before any row is written)
+    set_column_widths(ws, df)
     
     # Write headers
-    for col_idx, col_name in enumerate(df.columns, start=1):
-        cell = ws.cell(row=1, column=col_idx)
-        cell.value = col_name
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.border = thin_border
-    
-    # Write data
-    for row_idx, row_data in enumerate(df.values, start=2):
-        for col_idx, value in enumerate(row_data, start=1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.value = value
-            cell.border = thin_border
-            # Alternate row coloring
-            if row_idx % 2 == 0:
-                cell.fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-    
-    # Auto-adjust column widths
-    for col_idx, col_name in enumerate(df.columns, start=1):
-        max_length = max(
-            len(str(col_name)),
-            df[col_name].astype(str).map(len).max() if len(df) > 0 else 0
+    header_cells = []
+    for col_name in df.columns:
+        cell = WriteOnlyCell(ws, value=col_name)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGN
+        cell.border = THIN_BORDER
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    # Write data as plain rows; only the header row is styled per cell.
+    # itertuples streams rows lazily and keeps each column's dtype.
+    for row_data in df.itertuples(index=False, name=None):
+        ws.append(row_data)
+    
+    # Alternate row coloring as a single conditional formatting rule instead
+    # of styling every body cell
+    if len(df) > 0 and len(df.columns) > 0:
+        data_range = f"A2:{COL_LETTERS[len(df.columns)]}{len(df) + 1}"
+        ws.conditional_formatting.add(
+            data_range,
+            FormulaRule(formula=['MOD(ROW(),2)=0'], fill=ALT_ROW_FILL)
         )
-        ws.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 2, 50)
-
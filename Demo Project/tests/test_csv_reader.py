@@ -0,0 +1,48 @@
+"""
+Tests for the CSV reader shared by the report generators.
+
+Run from the "Demo Project" directory with: python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import unittest
+
+try:
+    import pandas as pd
+    from reports.participation import read_csv_with_encoding
+except ImportError:
+    pd = None
+
+
+@unittest.skipIf(pd is None, "pandas and openpyxl are required")
+class ReadCsvWithEncodingTests(unittest.TestCase):
+
+    def _read(self, text):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        self.addCleanup(os.remove, path)
+        return read_csv_with_encoding(path)
+
+    def test_duplicate_headers_are_renamed(self):
+        df = self._read("Name,Name,Department\nA,B,CS\nC,D,IT\n")
+        self.assertEqual(list(df.columns), ['Name', 'Name.1', 'Department'])
+
+    def test_leading_spaces_are_skipped(self):
+        df = self._read("Name, Department, Test Status\nA, CS, Passed\nB, IT, Failed\n")
+        self.assertEqual(list(df.columns), ['Name', 'Department', 'Test Status'])
+        self.assertEqual(list(df['Department']), ['CS', 'IT'])
+        self.assertEqual(list(df['Test Status']), ['Passed', 'Failed'])
+
+    def test_blank_headers_are_named_unnamed(self):
+        df = self._read("Name,,Department,\nA,1,CS,2\nB,3,IT,4\n")
+        self.assertEqual(list(df.columns), ['Name', 'Unnamed: 1', 'Department', 'Unnamed: 3'])
+
+    def test_iso_timestamps_stay_text(self):
+        df = self._read("Name,Submitted\nA,2026-01-07T10:00:00\nB,2026-01-08T11:30:00\n")
+        self.assertEqual(list(df['Submitted']), ['2026-01-07T10:00:00', '2026-01-08T11:30:00'])
+
+
+if __name__ == '__main__':
+    unittest.main()
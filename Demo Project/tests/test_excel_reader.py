@@ -0,0 +1,59 @@
+"""
+Tests for the Excel reader shared by the report generators.
+
+Run from the "Demo Project" directory with: python -m unittest discover tests
+"""
+
+import datetime
+import os
+import tempfile
+import unittest
+
+try:
+    import pandas as pd
+    from openpyxl import Workbook
+    from reports.participation import read_excel_file
+except ImportError:
+    pd = None
+
+
+@unittest.skipIf(pd is None, "pandas and openpyxl are required")
+class ReadExcelFileTests(unittest.TestCase):
+
+    def _write_workbook(self, rows, number_format=None):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = 'Overall Data'
+        for row in rows:
+            ws.append(row)
+        if number_format:
+            for cell in ws['B'][1:]:
+                cell.number_format = number_format
+        fd, path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+        wb.save(path)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_duration_cells_are_timedeltas(self):
+        path = self._write_workbook(
+            [['Name', 'Test Duration'],
+             ['A', datetime.timedelta(0)],
+             ['B', datetime.timedelta(minutes=12, seconds=5)]],
+            number_format='[h]:mm:ss'
+        )
+        df = read_excel_file(path)
+        durations = list(df['Test Duration'])
+        # pd.Timedelta subclasses datetime.timedelta
+        for value in durations:
+            self.assertIsInstance(value, datetime.timedelta)
+        self.assertEqual(durations, [datetime.timedelta(0), datetime.timedelta(minutes=12, seconds=5)])
+
+    def test_missing_sheet_raises_value_error(self):
+        path = self._write_workbook([['Name'], ['A']])
+        with self.assertRaises(ValueError):
+            read_excel_file(path, sheet_name='Missing')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Tests for the participation report output.
+
+Run from the "Demo Project" directory with: python -m unittest discover tests
+"""
+
+import io
+import unittest
+from unittest import mock
+
+try:
+    import pandas as pd
+    from openpyxl import load_workbook
+    from reports.participation import generate_participation_report
+except ImportError:
+    pd = None
+
+
+# Blank departments, statuses and names are not counted anywhere
+FIXTURE = {
+    'Name': ['A', 'B', 'C', 'D', 'E', 'F', 'G', None],
+    'Department': ['CS', 'CS', 'IT', 'IT', 'ME', None, 'CS', 'CS'],
+    'Test Status': ['Completed', 'Not Started', 'Completed', 'Completed', 'Not Started',
+                    'Completed', None, 'Completed'],
+}
+
+EXPECTED_SUMMARY = [
+    ['Department', 'Completed', 'Not Started', 'Grand Total'],
+    ['CS', 1, 1, 2],
+    ['IT', 2, 0, 2],
+    ['ME', 0, 1, 1],
+    ['Grand Total', 3, 2, 5],
+]
+
+
+@unittest.skipIf(pd is None, "pandas and openpyxl are required")
+class ParticipationReportTests(unittest.TestCase):
+
+    def _summary_rows(self):
+        output = io.BytesIO()
+        generate_participation_report(pd.DataFrame(FIXTURE), output)
+        output.seek(0)
+        ws = load_workbook(output)['Participation Summary']
+        return [list(row) for row in ws.iter_rows(values_only=True)]
+
+    def test_bincount_pivot(self):
+        self.assertEqual(self._summary_rows(), EXPECTED_SUMMARY)
+
+    def test_groupby_pivot(self):
+        # Force the groupby fallback used for very large department x status grids
+        with mock.patch('reports.participation._BINCOUNT_MAX_CELLS', 0):
+            self.assertEqual(self._summary_rows(), EXPECTED_SUMMARY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Tests for the Parul Weekly classification rules and summaries.
+
+Run from the "Demo Project" directory with: python -m unittest discover tests
+"""
+
+import datetime
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import pandas as pd
+    from openpyxl import Workbook, load_workbook
+    from reports.parul_weekly import (
+        _add_div_wise_participation_summary,
+        _compute_attempt_status,
+        _load_overall_data,
+        _stripped_text,
+        generate_parul_weekly_report,
+    )
+except ImportError:
+    pd = None
+
+
+@unittest.skipIf(pd is None, "pandas and openpyxl are required")
+class AttemptStatusTests(unittest.TestCase):
+    """
+    Zero durations read from xlsx and from CSV classify the same way:
+    only the literal text '0:00:00' is an unsuccessful attempt.
+    """
+
+    def _attempt_status(self, values):
+        return list(_compute_attempt_status(values, _stripped_text(values)))
+
+    def _load(self, suffix, write):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        write(path)
+        return _load_overall_data(path)['Test Duration']
+
+    def test_xlsx_zero_duration(self):
+        def write(path):
+            wb = Workbook()
+            ws = wb.active
+            ws.title = 'Overall Data'
+            ws.append(['Name', 'Test Duration'])
+            ws.append(['A', datetime.timedelta(0)])
+            ws.append(['B', datetime.timedelta(minutes=30)])
+            ws.append(['C', None])
+            for cell in ws['B'][1:]:
+                cell.number_format = '[h]:mm:ss'
+            wb.save(path)
+
+        values = self._load('.xlsx', write)
+        self.assertEqual(
+            self._attempt_status(values),
+            ['Successful Attempt', 'Successful Attempt', 'No Attempt']
+        )
+
+    def test_csv_zero_duration(self):
+        def write(path):
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.write("Name,Test Duration\nA,00:00:00\nB,00:30:00\nC,-\n")
+
+        values = self._load('.csv', write)
+        self.assertEqual(
+            self._attempt_status(values),
+            ['Successful Attempt', 'Successful Attempt', 'No Attempt']
+        )
+
+    def test_literal_zero_text_is_unsuccessful(self):
+        values = pd.Series(['0:00:00', '0:12:30', '', None])
+        self.assertEqual(
+            self._attempt_status(values),
+            ['Unsuccessful Attempt', 'Successful Attempt', 'No Attempt', 'No Attempt']
+        )
+
+
+@unittest.skipIf(pd is None, "pandas and openpyxl are required")
+class DivWiseParticipationTests(unittest.TestCase):
+
+    def test_department_with_only_blank_statuses_is_left_out(self):
+        df = pd.DataFrame({
+            'Name': ['A', 'B', 'C', 'D', 'E'],
+            'Department': ['CS', 'CS', 'IT', 'ME', None],
+            'Test Status': ['Completed', 'Not Started', 'Completed', None, 'Completed'],
+        })
+        wb = Workbook(write_only=True)
+        status_totals = _add_div_wise_participation_summary(wb, df)
+        output = io.BytesIO()
+        wb.save(output)
+        output.seek(0)
+
+        rows = [
+            list(row) for row in
+            load_workbook(output)['Div Wise Participation Summary'].iter_rows(values_only=True)
+        ]
+        self.assertEqual(rows, [
+            ['Department', 'Completed', 'Not Started', 'Grand Total'],
+            ['CS', 1, 1, 2],
+            ['IT', 1, 0, 1],
+            ['Grand Total', 2, 1, 3],
+        ])
+        # Rows without a department still count towards the overall totals
+        self.assertEqual(status_totals.to_dict(), {'Completed': 3, 'Not Started': 1})
+
+
+@unittest.skipIf(pd is None, "pandas and openpyxl are required")
+class ParulWeeklyReportTests(unittest.TestCase):
+
+    def test_summary_counts(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        input_path = os.path.join(tmp_dir, 'input.csv')
+        output_path = os.path.join(tmp_dir, 'report.xlsx')
+        with open(input_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(
+                "Name,Department,Test Status,Test Duration,Test Max Score,Test Student Score,Test Total Percentage\n"
+                "A,CS,Completed,0:30:00,100,80,80\n"
+                "B,CS,Completed,0:20:00,100,55,55\n"
+                "C,CS,Not Started,-,100,,-\n"
+                "D,IT,Completed,0:10:00,100,30,30\n"
+                "E,IT,Completed,0:00:00,100,10,0.1\n"
+                "F,,Completed,0:15:00,100,90,90\n"
+            )
+        generate_parul_weekly_report(input_path, output_path)
+        wb = load_workbook(output_path)
+
+        def rows(sheet_name):
+            return [list(row) for row in wb[sheet_name].iter_rows(values_only=True)]
+
+        categories = [
+            'Good (75%+)',
+            'Satisfactory (50% - 75%)',
+            'Needs Attention (25% - 50%)',
+            'Intervention (0% - 25%)',
+            'Not Started',
+        ]
+        # Department-less rows are left out of the div-wise tables but
+        # counted in the overall ones
+        self.assertEqual(rows('Div Wise Performance Summary'), [
+            ['Department'] + categories,
+            ['CS', 1, 1, 0, 0, 1],
+            ['IT', 0, 0, 1, 1, 0],
+            ['Grand Total', 1, 1, 1, 1, 1],
+        ])
+        self.assertEqual(rows('Overall Performance Summary'), [
+            ['Category', 'Count'],
+            [categories[0], 2],
+            [categories[1], 1],
+            [categories[2], 1],
+            [categories[3], 1],
+            [categories[4], 1],
+            ['Grand Total', 6],
+        ])
+        self.assertEqual(rows('Div Wise Participation Summary'), [
+            ['Department', 'Completed', 'Not Started', 'Grand Total'],
+            ['CS', 2, 1, 3],
+            ['IT', 2, 0, 2],
+            ['Grand Total', 4, 1, 5],
+        ])
+        self.assertEqual(rows('Overall Participation Summary'), [
+            ['Test Status', 'Count'],
+            ['Completed', 5],
+            ['Not Started', 1],
+            ['Grand Total', 6],
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
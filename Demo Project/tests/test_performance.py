@@ -0,0 +1,86 @@
+"""
+Tests for the performance report output.
+
+Run from the "Demo Project" directory with: python -m unittest discover tests
+"""
+
+import datetime
+import io
+import unittest
+
+try:
+    import pandas as pd
+    from openpyxl import load_workbook
+    from reports.performance import generate_performance_report
+except ImportError:
+    pd = None
+
+
+def _sheet_rows(workbook, sheet_name):
+    return [list(row) for row in workbook[sheet_name].iter_rows(values_only=True)]
+
+
+@unittest.skipIf(pd is None, "pandas and openpyxl are required")
+class PerformanceReportTests(unittest.TestCase):
+
+    def _generate(self, df):
+        output = io.BytesIO()
+        generate_performance_report(df, output)
+        output.seek(0)
+        return load_workbook(output)
+
+    def test_timedelta_column_is_written_as_durations(self):
+        df = pd.DataFrame({
+            'Name': ['A', 'B'],
+            'Department': ['CS', 'IT'],
+            'Test Status': ['Completed', 'Completed'],
+            'Total Percentage': [80, 40],
+            'Test Duration': pd.to_timedelta(['0s', '30min']),
+            'Attempts': [1, 2],
+        })
+        wb = self._generate(df)
+        rows = _sheet_rows(wb, 'Data')
+
+        header = rows[0]
+        self.assertEqual(header[4], 'Category')
+        duration_idx = header.index('Test Duration')
+        self.assertEqual(
+            [row[duration_idx] for row in rows[1:]],
+            [datetime.timedelta(0), datetime.timedelta(minutes=30)]
+        )
+        attempts_idx = header.index('Attempts')
+        self.assertEqual([row[attempts_idx] for row in rows[1:]], [1, 2])
+
+    def test_performance_summary_counts(self):
+        df = pd.DataFrame({
+            'Name': ['A', 'B', 'C', 'D', 'E'],
+            'Department': ['CS', 'CS', 'CS', 'IT', 'IT'],
+            'Test Status': ['Completed', 'Completed', 'Not Started', 'Completed', 'Completed'],
+            'Total Percentage': ['80', '60%', '-', '30', '90'],
+        })
+        wb = self._generate(df)
+
+        # Every category gets a column, in report order, even with no rows
+        # (nobody here is in Intervention)
+        self.assertEqual(_sheet_rows(wb, 'Performance Summary'), [
+            ['Department', 'Good', 'Satisfactory', 'Need Attention', 'Intervention',
+             'Not Attended', 'Grand Total'],
+            ['CS', 1, 1, 0, 0, 1, 3],
+            ['IT', 1, 0, 1, 0, 0, 2],
+            ['Grand Total', 2, 1, 1, 0, 1, 5],
+        ])
+        self.assertEqual(_sheet_rows(wb, 'Participation Summary'), [
+            ['Department', 'Completed', 'Not Started', 'Grand Total'],
+            ['CS', 2, 1, 3],
+            ['IT', 2, 0, 2],
+            ['Grand Total', 4, 1, 5],
+        ])
+        data_rows = _sheet_rows(wb, 'Data')
+        self.assertEqual(
+            [row[4] for row in data_rows],
+            ['Category', 'Good', 'Satisfactory', 'Not Attended', 'Need Attention', 'Good']
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()